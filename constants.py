@@ -3,7 +3,16 @@ from __future__ import annotations
 from typing import Dict
 
 max_tries: Dict = {
-    'open_oracle_ebusiness_suite': 3
+    'open_oracle_ebusiness_suite': 3,
+    'add_html_row': 3,
+    'follow_auto_submit_form': 5
+}
+
+http: Dict = {
+    # Connections kept alive per host by the browserless session.
+    'pool_maxsize': 10,
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:80.0) '
+                  'Gecko/20100101 Firefox/80.0'
 }
 
 urls: Dict = {
@@ -19,8 +28,23 @@ urls: Dict = {
 
 timecard: Dict = {
     'html': {
-        'table_tbody_xpath': "//span[@id='Hxctimecard']/table[2]//table[2]/tbody/tr[5]/td/table/tbody/tr[5]/td[2]/table/tbody"
+        'table_tbody_xpath': "//span[@id='Hxctimecard']/table[2]//table[2]/tbody/tr[5]/td/table/tbody/tr[5]/td[2]/table/tbody",
+        'num_header_rows': 1,
+        'add_row_button_text': "Add Another Row",
+        'save_button_text': "Save",
+        'recent_timecards': {
+            # One per timecard in the Recent Timecards table.
+            'details_link_css_selector': "a[title='Details']",
+            'next_page_link_xpath': "//a[starts-with(normalize-space(.), 'Next')]"
+        }
     },
+    'csv_header': [
+        'Project', 'Task', 'Type', 'Work_Location_Country',
+        'Work_Location_State_Province', 'Sat_Start', 'Sat_Stop', 'Sun_Start',
+        'Sun_Stop', 'Mon_Start', 'Mon_Stop', 'Tue_Start', 'Tue_Stop',
+        'Wed_Start', 'Wed_Stop', 'Thu_Start', 'Thu_Stop', 'Fri_Start',
+        'Fri_Stop'
+    ],
     # Project, Task, Type, Work_Location_Country, Work_Location_State_Province
     'num_cols_before_time': 5,
     'sleep_time': {
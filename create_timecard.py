@@ -1,14 +1,44 @@
 from __future__ import annotations
 
+import constants
+import metrics
 from otl import OracleTimeAndLabor
 
 import logging
 import sys
 import toml
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 
-def main():
+def create_engine(config: Dict, secrets: Optional[Dict]) -> Any:
+    """Creates the browser or browserless session chosen in the config."""
+    engine_config: Dict = config.get('engine', {})
+    if engine_config.get('choice', "browser") == "http":
+        # Experimental, so its extra dependencies are only needed when chosen.
+        from otl_http import OracleTimeAndLaborHttp
+        logging.info("Creating browserless session")
+        return OracleTimeAndLaborHttp(
+            default_wait_time=config['browser']['webdriver'][
+                'default_wait_time'
+            ],
+            sso_username=secrets['username'] if secrets is not None else None,
+            sso_password=secrets['password'] if secrets is not None else None,
+            urls={**constants.urls['oracle'], **engine_config.get('urls', {})}
+        )
+    logging.info("Creating browser instance")
+    browser_choice: str = config['browser']['choice']
+    return OracleTimeAndLabor(
+        browser=browser_choice,
+        driver_path=config['browser']['webdriver'][browser_choice]['path'],
+        default_wait_time=config['browser']['webdriver']['default_wait_time'],
+        # Will need to manually input login details if not provided.
+        sso_username=secrets['username'] if secrets is not None else None,
+        sso_password=secrets['password'] if secrets is not None else None
+    )
+
+
+def set_up() -> Tuple[Dict, Optional[Dict]]:
+    """Sets up logging, then loads the config and the secrets if found."""
     # Set up logging.
     logging_handlers: List[Any] = [
         # logging.FileHandler(filename="create_timecard.log"),  # Log to file.
@@ -25,29 +55,51 @@ def main():
     logging.info("Loading config file")
     config: Dict = toml.load("config.toml")
     # Load secrets file if found.
-    is_secrets_found: bool = False
+    secrets: Optional[Dict] = None
     try:
-        secrets: Dict = toml.load(config['secrets']['file']['path'])
-        is_secrets_found = True
+        secrets = toml.load(config['secrets']['file']['path'])
     except FileNotFoundError:
         pass
+    return config, secrets
 
-    logging.info("Creating browser instance")
-    browser_choice: str = config['browser']['choice']
-    browser: OracleTimeAndLabor = OracleTimeAndLabor(
-        browser=browser_choice,
-        driver_path=config['browser']['webdriver'][browser_choice]['path'],
-        default_wait_time=config['browser']['webdriver']['default_wait_time'],
-        # Will need to manually input login details if not provided.
-        sso_username=secrets['username'] if is_secrets_found else None,
-        sso_password=secrets['password'] if is_secrets_found else None
-    )
-    browser.open_oracle_ebusiness_suite()
-    browser.navigate_to_recent_timecards()
-    browser.create_new_timecard()
-    browser.fill_in_timecard_details(
-        timecard_path=config['timecard']['file']['path']
-    )
+
+def start_metrics(config: Dict) -> Optional[metrics.FileWriter]:
+    """Exposes the metrics if set up, returning the file writer if any."""
+    metrics_config: Dict = config.get('metrics', {})
+    if metrics_config.get('port', 0) != 0:
+        try:
+            metrics.start_http_server(metrics_config['port'])
+        except OSError as err:
+            # Such as when another run is already serving on the port.
+            logging.warning(
+                f"Not serving metrics on port {metrics_config['port']}: {err}"
+            )
+    metrics_file_writer: Optional[metrics.FileWriter] = None
+    if metrics_config.get('file_path', "") != "":
+        metrics_file_writer = metrics.FileWriter(
+            path=metrics_config['file_path'],
+            interval=metrics_config.get('file_interval', 15)
+        )
+        metrics_file_writer.start()
+    return metrics_file_writer
+
+
+def main():
+    config, secrets = set_up()  # type: Dict, Optional[Dict]
+    metrics_file_writer: Optional[metrics.FileWriter] = start_metrics(config)
+    try:
+        # Launch failures count as failed timecards too.
+        with metrics.track_card():
+            browser: Any = create_engine(config, secrets)
+            browser.open_oracle_ebusiness_suite()
+            browser.navigate_to_recent_timecards()
+            browser.create_new_timecard()
+            browser.fill_in_timecard_details(
+                timecard_path=config['timecard']['file']['path']
+            )
+    finally:
+        if metrics_file_writer is not None:
+            metrics_file_writer.stop()
     logging.info(f"END {sys.argv[0]}\n")
 
 
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from create_timecard import create_engine, set_up, start_metrics
+import metrics
+from selenium_extras.additional_exceptions import BrowserNotExpected
+
+import logging
+import sys
+from typing import Any, Dict, Optional
+
+
+def main():
+    config, secrets = set_up()  # type: Dict, Optional[Dict]
+    metrics_file_writer: Optional[metrics.FileWriter] = start_metrics(config)
+    try:
+        browser: Any = create_engine(config, secrets)
+        if not hasattr(browser, "export_recent_timecards"):
+            raise BrowserNotExpected(
+                "Exporting needs a browser, so set the engine choice to "
+                "\"browser\"."
+            )
+        browser.open_oracle_ebusiness_suite()
+        browser.navigate_to_recent_timecards()
+        browser.export_recent_timecards(
+            export_dir=config.get('export', {}).get('directory', {}).get(
+                'path', "exported_timecards"
+            )
+        )
+    finally:
+        if metrics_file_writer is not None:
+            metrics_file_writer.stop()
+    logging.info(f"END {sys.argv[0]}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+from html.parser import HTMLParser
+import re
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+
+class HtmlNode():
+    """An element within a parsed HTML page.
+
+    Parameters
+    ----------
+        tag : str
+            Lowercased tag name. The root of a page is "#document".
+        attrs : dict
+            The element's attributes.
+        parent : HtmlNode, optional
+            The element containing this one.
+
+    Attributes
+    ----------
+        children : list of HtmlNode
+            Child elements in document order.
+        text_parts : list of str
+            Text directly within this element, excluding its children's.
+    """
+
+    def __init__(
+        self,
+        tag: str,
+        attrs: Optional[Dict[str, str]] = None,
+        parent: Optional[HtmlNode] = None
+    ) -> None:
+        self.tag: str = tag
+        self.attrs: Dict[str, str] = attrs if attrs is not None else {}
+        self.parent: Optional[HtmlNode] = parent
+        self.children: List[HtmlNode] = []
+        self.text_parts: List[str] = []
+        if parent is not None:
+            parent.children.append(self)
+
+    def iter_descendants(self) -> Iterator[HtmlNode]:
+        """Iterates through every element below this one in document order."""
+        for child in self.children:
+            yield child
+            yield from child.iter_descendants()
+
+    def get_own_text(self) -> str:
+        return "".join(self.text_parts)
+
+    def get_text(self) -> str:
+        """Gets the text within this element and all of its children."""
+        return self.get_own_text() + "".join(
+            child.get_text() for child in self.children
+        )
+
+    def get_ancestor(self, tag: str) -> Optional[HtmlNode]:
+        """Gets the closest enclosing element with the specified tag."""
+        ancestor: Optional[HtmlNode] = self.parent
+        while ancestor is not None and ancestor.tag != tag:
+            ancestor = ancestor.parent
+        return ancestor
+
+
+class _TreeBuilder(HTMLParser):
+    """Builds an HtmlNode tree, closing elements the way browsers would."""
+
+    _void_tags: Tuple[str, ...] = (
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+        "meta", "param", "source", "track", "wbr"
+    )
+    # Starting one of the keys implicitly closes any open tag in its value,
+    # up to the closest enclosing table.
+    _implicitly_closed_tags: Dict[str, Tuple[str, ...]] = {
+        "tr": ("tr", "td", "th"),
+        "td": ("td", "th"),
+        "th": ("td", "th"),
+        "option": ("option",)
+    }
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root: HtmlNode = HtmlNode("#document")
+        self._current: HtmlNode = self.root
+
+    def handle_starttag(self, tag: str, attrs: List) -> None:
+        for closed_tag in self._implicitly_closed_tags.get(tag, ()):
+            self._close_open_tag(closed_tag, stop_tag="table")
+        if tag == "tr" and self._current.tag == "table":
+            # Browsers insert the tbody, which the XPaths rely on.
+            self._current = HtmlNode("tbody", parent=self._current)
+        node: HtmlNode = HtmlNode(
+            tag,
+            {
+                name: value if value is not None else ""
+                for name, value in attrs
+            },
+            self._current
+        )
+        if tag not in self._void_tags:
+            self._current = node
+
+    def handle_startendtag(self, tag: str, attrs: List) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in self._void_tags:
+            self._current = self._current.parent or self.root
+
+    def handle_endtag(self, tag: str) -> None:
+        self._close_open_tag(tag)
+
+    def handle_data(self, data: str) -> None:
+        self._current.text_parts.append(data)
+
+    def _close_open_tag(
+        self, tag: str, stop_tag: Optional[str] = None
+    ) -> None:
+        """Closes the closest open tag, ignoring it if it is not open."""
+        node: Optional[HtmlNode] = self._current
+        while node is not None and node.tag != tag:
+            if node.tag == stop_tag:
+                return
+            node = node.parent
+        if node is not None and node is not self.root:
+            self._current = node.parent or self.root
+
+
+class OaForm():
+    """The state of an HTML form, ready to be posted back.
+
+    Parameters
+    ----------
+        node : HtmlNode
+            The form element.
+        page_url : str
+            Url of the page the form is in, used to resolve its action.
+
+    Attributes
+    ----------
+        name : str
+            The form's name, such as "DefaultFormName" in OA Framework pages.
+        action : str
+            Absolute url the form posts to.
+        method : str
+            Uppercased HTTP method of the form.
+        fields : dict
+            Successful control values keyed by their names, including the
+            hidden state fields that OA Framework expects to be posted back.
+    """
+
+    def __init__(self, node: HtmlNode, page_url: str) -> None:
+        self.node: HtmlNode = node
+        self.name: str = node.attrs.get("name", node.attrs.get("id", ""))
+        self.action: str = urljoin(page_url, node.attrs.get("action", ""))
+        self.method: str = node.attrs.get("method", "GET").upper()
+        self.fields: Dict[str, str] = self._get_field_values()
+
+    def get_payload(self, event_params: Optional[Dict] = None) -> Dict:
+        """Gets the fields to post, overridden by any event parameters."""
+        payload: Dict[str, str] = dict(self.fields)
+        if event_params is not None:
+            payload.update(event_params)
+        return payload
+
+    def _get_field_values(self) -> Dict[str, str]:
+        fields: Dict[str, str] = {}
+        for node in self.node.iter_descendants():
+            name: Optional[str] = node.attrs.get("name")
+            if name is None or "disabled" in node.attrs:
+                continue
+            if node.tag == "input":
+                input_type: str = node.attrs.get("type", "text").lower()
+                if input_type in (
+                    "submit", "button", "image", "reset", "file"
+                ):
+                    continue  # Only sent when they are the clicked control.
+                if (
+                    input_type in ("checkbox", "radio")
+                    and "checked" not in node.attrs
+                ):
+                    continue
+                fields[name] = node.attrs.get("value", "")
+            elif node.tag == "textarea":
+                fields[name] = node.get_text()
+            elif node.tag == "select":
+                options: List[HtmlNode] = [
+                    option for option in node.iter_descendants()
+                    if option.tag == "option"
+                ]
+                selected_options: List[HtmlNode] = [
+                    option for option in options if "selected" in option.attrs
+                ] or options[:1]
+                if len(selected_options) > 0:
+                    fields[name] = selected_options[0].attrs.get(
+                        "value", selected_options[0].get_text().strip()
+                    )
+        return fields
+
+
+class OaPage():
+    """A fetched Oracle Applications Framework page.
+
+    Parameters
+    ----------
+        url : str
+            The final url of the page, after any redirects.
+        html : str
+            The page source.
+
+    Attributes
+    ----------
+        root : HtmlNode
+            The parsed document.
+    """
+
+    _xpath_step_regex: re.Pattern = re.compile(
+        r"(//|/)([\w*]+)((?:\[[^\]]*\])*)"
+    )
+    _xpath_predicate_regex: re.Pattern = re.compile(r"\[([^\]]*)\]")
+    # Matches the event parameters in OA Framework's client-side
+    # submitForm('DefaultFormName', 1, {'event': 'Create', ...}) calls.
+    _submit_form_regex: re.Pattern = re.compile(
+        r"submitForm\(\s*['\"]([^'\"]*)['\"][^{]*\{([^}]*)\}"
+    )
+    _js_object_entry_regex: re.Pattern = re.compile(
+        r"['\"]([^'\"]+)['\"]\s*:\s*['\"]([^'\"]*)['\"]"
+    )
+
+    def __init__(self, url: str, html: str) -> None:
+        self.url: str = url
+        tree_builder: _TreeBuilder = _TreeBuilder()
+        tree_builder.feed(html)
+        tree_builder.close()
+        self.root: HtmlNode = tree_builder.root
+
+    def get_element_by_id(self, id: str) -> Optional[HtmlNode]:
+        """Gets the element that has the specified id."""
+        for node in self.root.iter_descendants():
+            if node.attrs.get("id") == id:
+                return node
+        return None
+
+    def get_elements_by_link_text(self, link_text: str) -> List[HtmlNode]:
+        """Gets a list of the links with the specified link text."""
+        return [
+            node for node in self.root.iter_descendants()
+            if node.tag == "a" and node.get_text().strip() == link_text
+        ]
+
+    def get_elements_by_xpath(
+        self, xpath: str, context: Optional[HtmlNode] = None
+    ) -> List[HtmlNode]:
+        """Gets a list of the elements in the specified XPath.
+
+        Only the subset of XPath used by this project is supported: child and
+        descendant steps with positional, @attribute='value', and
+        contains(., 'text') or contains(text(), 'text') predicates.
+        """
+        steps: List[Tuple[str, str, str]] = []
+        position: int = 0
+        for match in self._xpath_step_regex.finditer(xpath):
+            if match.start() != position:
+                break
+            steps.append(match.groups())
+            position = match.end()
+        if position != len(xpath):
+            raise ValueError(f"Unsupported XPath: {xpath}")
+        nodes: List[HtmlNode] = [context if context is not None else self.root]
+        for separator, tag, predicates in steps:
+            parents: List[HtmlNode] = nodes
+            if separator == "//":
+                parents = self._unique([
+                    descendant
+                    for node in nodes
+                    for descendant in [node, *node.iter_descendants()]
+                ])
+            nodes = self._unique([
+                child
+                for parent in parents
+                for child in self._filter_by_predicates(
+                    [
+                        child for child in parent.children
+                        if tag == "*" or child.tag == tag
+                    ],
+                    self._xpath_predicate_regex.findall(predicates)
+                )
+            ])
+        return nodes
+
+    def get_forms(self) -> List[OaForm]:
+        return [
+            OaForm(node, self.url) for node in self.root.iter_descendants()
+            if node.tag == "form"
+        ]
+
+    def get_form_of(self, node: HtmlNode) -> Optional[OaForm]:
+        """Gets the form the element belongs to."""
+        form_node: Optional[HtmlNode] = node.get_ancestor("form")
+        if form_node is None and "form" in node.attrs:
+            form_node = self.get_element_by_id(node.attrs["form"])
+        if form_node is None:
+            return None
+        return OaForm(form_node, self.url)
+
+    def get_submit_form_params(self, node: HtmlNode) -> Tuple[str, Dict]:
+        """Gets the form name and event parameters an element submits with.
+
+        Returns an empty form name if the element does not call submitForm.
+        """
+        match: Optional[re.Match] = self._submit_form_regex.search(
+            node.attrs.get("onclick", "") + node.attrs.get("href", "")
+        )
+        if match is None:
+            return "", {}
+        return match.group(1), dict(
+            self._js_object_entry_regex.findall(match.group(2))
+        )
+
+    def _filter_by_predicates(
+        self, nodes: List[HtmlNode], predicates: List[str]
+    ) -> List[HtmlNode]:
+        for predicate in predicates:
+            predicate = predicate.strip()
+            if predicate.isdigit():
+                index: int = int(predicate) - 1  # XPath is 1-indexed.
+                nodes = nodes[index:index + 1]
+                continue
+            attribute_match: Optional[re.Match] = re.fullmatch(
+                r"@([\w-]+)\s*=\s*['\"](.*)['\"]", predicate
+            )
+            contains_match: Optional[re.Match] = re.fullmatch(
+                r"contains\(\s*(\.|text\(\))\s*,\s*['\"](.*)['\"]\s*\)",
+                predicate
+            )
+            if attribute_match is not None:
+                name, value = attribute_match.groups()
+                nodes = [
+                    node for node in nodes if node.attrs.get(name) == value
+                ]
+            elif contains_match is not None:
+                target, text = contains_match.groups()
+                nodes = [
+                    node for node in nodes
+                    if text in (
+                        node.get_text() if target == "."
+                        else node.get_own_text()
+                    )
+                ]
+            else:
+                raise ValueError(f"Unsupported XPath predicate: [{predicate}]")
+        return nodes
+
+    def _unique(self, nodes: List[HtmlNode]) -> List[HtmlNode]:
+        seen_ids: Set[int] = set()
+        unique_nodes: List[HtmlNode] = []
+        for node in nodes:
+            if id(node) not in seen_ids:
+                seen_ids.add(id(node))
+                unique_nodes.append(node)
+        return unique_nodes
@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+import functools
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+
+class Metric():
+    """Base class for metrics rendered in the Prometheus text format.
+
+    Parameters
+    ----------
+        name : str
+            Metric name, such as "otl_cards_completed_total".
+        help_text : str
+            Description shown in the HELP line.
+        label_names : tuple of str, optional
+            Names of the labels every observation is grouped by.
+    """
+
+    metric_type: str = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Tuple[str, ...] = ()
+    ) -> None:
+        self.name: str = name
+        self.help_text: str = help_text
+        self.label_names: Tuple[str, ...] = label_names
+        self._lock: threading.Lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def render(self) -> List[str]:
+        """Gets the HELP, TYPE, and sample lines of this metric."""
+        lines: List[str] = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.metric_type}"
+        ]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.extend(self._render_samples(label_values, value))
+        return lines
+
+    def _render_samples(
+        self, label_values: Tuple[str, ...], value: Any
+    ) -> List[str]:
+        return [
+            f"{self.name}{self._format_labels(label_values)} "
+            f"{_format_number(value)}"
+        ]
+
+    def _get_label_values(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _format_labels(
+        self,
+        label_values: Tuple[str, ...],
+        extra_labels: Tuple[Tuple[str, str], ...] = ()
+    ) -> str:
+        pairs: List[Tuple[str, str]] = [
+            *zip(self.label_names, label_values), *extra_labels
+        ]
+        if len(pairs) == 0:
+            return ""
+        return "{" + ",".join(
+            '{name}="{value}"'.format(
+                name=name,
+                value=value.replace("\\", "\\\\").replace('"', '\\"')
+            )
+            for name, value in pairs
+        ) + "}"
+
+
+class Counter(Metric):
+    """A count that only goes up."""
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        label_values: Tuple[str, ...] = self._get_label_values(labels)
+        with self._lock:
+            self._values[label_values] =  \
+                self._values.get(label_values, 0) + amount
+
+
+class Gauge(Metric):
+    """A value that can go up and down."""
+
+    metric_type = "gauge"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        label_values: Tuple[str, ...] = self._get_label_values(labels)
+        with self._lock:
+            self._values[label_values] =  \
+                self._values.get(label_values, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Counts observations into cumulative buckets.
+
+    Parameters
+    ----------
+        name : str
+            Metric name, such as "otl_phase_duration_seconds".
+        help_text : str
+            Description shown in the HELP line.
+        label_names : tuple of str, optional
+            Names of the labels every observation is grouped by.
+        buckets : tuple of float, optional
+            Upper bounds of the buckets, in increasing order. The +Inf bucket
+            is always added.
+    """
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = (
+            0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300
+        )
+    ) -> None:
+        super().__init__(name, help_text, label_names)
+        self.buckets: Tuple[float, ...] = buckets
+
+    def observe(self, value: float, **labels: str) -> None:
+        label_values: Tuple[str, ...] = self._get_label_values(labels)
+        with self._lock:
+            bucket_counts, total, count = self._values.get(
+                label_values, ([0] * len(self.buckets), 0.0, 0)
+            )
+            bucket_counts = [
+                bucket_count + (1 if value <= upper_bound else 0)
+                for bucket_count, upper_bound in zip(
+                    bucket_counts, self.buckets
+                )
+            ]
+            self._values[label_values] = (
+                bucket_counts, total + value, count + 1
+            )
+
+    def _render_samples(
+        self, label_values: Tuple[str, ...], value: Any
+    ) -> List[str]:
+        bucket_counts, total, count = value
+        lines: List[str] = [
+            "{name}_bucket{labels} {count}".format(
+                name=self.name,
+                labels=self._format_labels(
+                    label_values, (("le", _format_number(upper_bound)),)
+                ),
+                count=bucket_count
+            )
+            for bucket_count, upper_bound in zip(bucket_counts, self.buckets)
+        ]
+        labels: str = self._format_labels(label_values)
+        lines.extend([
+            "{name}_bucket{labels} {count}".format(
+                name=self.name,
+                labels=self._format_labels(label_values, (("le", "+Inf"),)),
+                count=count
+            ),
+            f"{self.name}_sum{labels} {_format_number(total)}",
+            f"{self.name}_count{labels} {count}"
+        ])
+        return lines
+
+
+class Registry():
+    """Collection of metrics that are rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Any) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text format."""
+        return "\n".join(
+            line for metric in self._metrics for line in metric.render()
+        ) + "\n"
+
+
+registry: Registry = Registry()
+
+cards_in_flight: Gauge = registry.register(Gauge(
+    "otl_cards_in_flight", "Timecards currently being filled out."
+))
+cards_completed: Counter = registry.register(Counter(
+    "otl_cards_completed_total", "Timecards filled out successfully."
+))
+cards_failed: Counter = registry.register(Counter(
+    "otl_cards_failed_total",
+    "Timecards that failed, grouped by exception type.",
+    label_names=("exception",)
+))
+phase_duration: Histogram = registry.register(Histogram(
+    "otl_phase_duration_seconds",
+    "Time spent in each step of filling out a timecard.",
+    label_names=("phase",)
+))
+webdriver_commands: Counter = registry.register(Counter(
+    "otl_webdriver_commands_total",
+    "Commands sent to the browser, grouped by command.",
+    label_names=("command",)
+))
+
+# Timeouts from selenium's waits and from requests are all counted as
+# TimeoutError, which is what this project raises for its own timeouts.
+_exception_labels: Dict[str, str] = {
+    "TimeoutException": "TimeoutError",
+    "ConnectTimeout": "TimeoutError",
+    "ReadTimeout": "TimeoutError"
+}
+
+# Start at zero so that the samples show up before anything happens.
+cards_in_flight.inc(0)
+cards_completed.inc(0)
+for exception_name in (
+    "SubtaskNotFound", "IncorrectLoginDetails", "MaxTriesReached",
+    "TimeoutError"
+):
+    cards_failed.inc(0, exception=exception_name)
+
+
+def observe_duration(phase: str) -> Any:
+    """Wrapper that records how long a function takes into phase_duration.
+
+    Parameters
+    ----------
+        phase : str
+            Value of the phase label, such as "login" or "row_add".
+    """
+    def decorate(func):
+        """ Decorator """
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            """ Actual wrapping """
+            start_time: float = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                phase_duration.observe(
+                    time.perf_counter() - start_time, phase=phase
+                )
+        return call
+    return decorate
+
+
+@contextmanager
+def track_card() -> Iterator[None]:
+    """Counts the timecard filled out within as in flight, then its outcome.
+
+    Exceptions are counted by their type and raised again. Timeouts are all
+    counted as TimeoutError.
+    """
+    cards_in_flight.inc()
+    try:
+        yield
+    except Exception as error:
+        exception_name: str = type(error).__name__
+        cards_failed.inc(
+            exception=_exception_labels.get(exception_name, exception_name)
+        )
+        raise
+    else:
+        cards_completed.inc()
+    finally:
+        cards_in_flight.dec()
+
+
+def count_driver_commands(driver: Any) -> None:
+    """Counts every command the driver sends into webdriver_commands.
+
+    Selenium webdrivers send everything, including element commands, through
+    execute. The DevTools driver sends everything through send.
+    """
+    method_name: str = "execute" if hasattr(driver, "execute") else "send"
+    send_command: Callable = getattr(driver, method_name)
+
+    @functools.wraps(send_command)
+    def counted_send_command(command: str, *args, **kwargs):
+        webdriver_commands.inc(command=command)
+        return send_command(command, *args, **kwargs)
+    setattr(driver, method_name, counted_send_command)
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body: bytes = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header(
+            "Content-Type", "text/plain; version=0.0.4; charset=utf-8"
+        )
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Keep scrapes out of the timecard logs.
+
+
+def start_http_server(
+    port: int, host: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """Serves the metrics at http://host:port/metrics from a daemon thread."""
+    server: ThreadingHTTPServer = ThreadingHTTPServer(
+        (host, port), _MetricsRequestHandler
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def write_file(path: str) -> None:
+    """Writes the metrics to a file, replacing it in one step."""
+    temporary_path: str = path + ".tmp"
+    with open(temporary_path, "w") as metrics_file:
+        metrics_file.write(registry.render())
+    os.replace(temporary_path, path)
+
+
+class FileWriter(threading.Thread):
+    """Daemon thread that periodically writes the metrics to a file.
+
+    Failed writes are logged instead of raised so that they never stop a run.
+
+    Parameters
+    ----------
+        path : str
+            File the metrics are written to, such as a node_exporter textfile
+            collector file.
+        interval : float, optional
+            Amount of time in seconds between writes.
+    """
+
+    def __init__(self, path: str, interval: float = 15) -> None:
+        super().__init__(daemon=True)
+        self.path: str = path
+        self.interval: float = interval
+        self._stop_event: threading.Event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self._write()
+
+    def stop(self) -> None:
+        """Stops the thread and writes the final values."""
+        self._stop_event.set()
+        self.join()
+        self._write()
+
+    def _write(self) -> None:
+        try:
+            write_file(self.path)
+        except OSError as err:
+            logging.warning(f"Could not write the metrics file: {err}")
+
+
+def _format_number(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
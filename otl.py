@@ -1,31 +1,157 @@
 from __future__ import annotations
 
 import constants
+import metrics
 import selenium_extras.additional_expected_conditions as AdditionalEC
 from selenium_extras.additional_exceptions import (
-    IncorrectLoginDetails, MaxTriesReached, SubtaskNotFound
+    ElementNotFound, IncorrectLoginDetails, MaxTriesReached, SubtaskNotFound
 )
+from selenium_extras.cached_table import CachedTable
 from selenium_extras.wrapper import Browser
 from utils import log_wrap
 
 import csv
 from datetime import datetime
 import logging
+import os
+import re
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 import time
-from typing import Any, Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
-class OracleTimeAndLabor(Browser):
+# Reads every row of the timecard table in a single call. Takes the tbody's
+# XPath and the number of header rows. Returns null until the table is on the
+# page.
+_EXTRACT_TIMECARD_ROWS_JS: str = """
+const [xpath, numHeaderRows] = arguments;
+const tbody = document.evaluate(
+    xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+if (tbody === null) {
+    return null;
+}
+const rows = Array.from(tbody.rows).slice(numHeaderRows).filter(
+    (row) => row.querySelector('button') === null
+).map((row) => {
+    const inputs = Array.from(row.querySelectorAll('input'));
+    if (inputs.length > 0) {
+        return inputs.map((input) => input.value);
+    }
+    // Submitted timecards show their values as text instead of inputs.
+    return Array.from(row.querySelectorAll('td')).filter(
+        (cell) => cell.querySelector('td') === null
+    ).map((cell) => cell.innerText.trim());
+}).filter((values) => values.some((value) => value !== ''));
+return {rows: rows};
+"""
+
+
+class TimecardCsv():
+    """Reads the timecard csv rows into the timecard website's input values.
+
+    Shared by the browser and the browserless ways of filling out a timecard.
+    """
+
+    def _row_data_generator(self, csv_row: List[str]) -> Iterator[str]:
+        """Iterates through the data within a row."""
+        row_len: int = len(csv_row)
+        current_col: int = 0
+        while current_col < row_len:
+            yield csv_row[current_col]
+            current_col += 1
+
+    def _is_time_entered(self, csv_row: List[str]) -> bool:
+        """Checks if there are any time entries within a csv row."""
+        row_len: int = len(csv_row)
+        is_time_entered: bool = False
+        for i in range(constants.timecard['num_cols_before_time'], row_len):
+            if csv_row[i] not in (None, ""):
+                is_time_entered = True
+                break
+        return is_time_entered
+
+    def _get_html_input_num(self, csv_col_num: int) -> int:
+        """Gets the number of the html input that a csv column goes into."""
+        num_cols_before_time: int = constants.timecard['num_cols_before_time']
+        if csv_col_num < num_cols_before_time:
+            # The html and csv cols are still matching here.
+            return csv_col_num
+        # The total csv columns and total html inputs don't match, since the
+        # website has an extra input for hours after every stop time.
+        return csv_col_num + (csv_col_num - num_cols_before_time) // 2
+
+    def _html_input_data_generator(
+        self, csv_row: List[str]
+    ) -> Iterator[Tuple[int, str]]:
+        """Iterates through the html input numbers and the data for them.
+
+        Time cells that are empty or cannot be parsed are skipped, since their
+        inputs are left as is.
+        """
+        for csv_col_num, cell_data in enumerate(
+            self._row_data_generator(csv_row)
+        ):  # type: int, str
+            html_input_num: int = self._get_html_input_num(csv_col_num)
+            if csv_col_num < constants.timecard['num_cols_before_time']:
+                yield html_input_num, cell_data
+            elif cell_data not in (None, ""):
+                parsed_data: Optional[datetime] = self._parse_time(cell_data)
+                if parsed_data is not None:
+                    yield html_input_num, self._convert_into_time_format(
+                        parsed_data
+                    )
+
+    def _parse_time(self, data: str) -> Optional[datetime]:
+        """Converts string into a datetime object."""
+        parsed_data: Optional[datetime] = None
+        # Accept these formats.
+        for time_format in ["%H:%M", "%I:%M:%S %p", "%I:%M %p", "%X"]:
+            try:
+                parsed_data = datetime.strptime(
+                    data, time_format
+                )
+                break
+            except (TypeError, ValueError):
+                pass
+        return parsed_data
+
+    def _convert_into_time_format(self, data: datetime) -> str:
+        """Converts datetime object to the website's accepted time format."""
+        return data.strftime("%H:%M")
+
+    def _get_csv_row(self, html_row_values: List[str]) -> List[str]:
+        """Converts the values of a row on the website into a csv row."""
+        csv_row: List[str] = []
+        for csv_col_num in range(
+            len(constants.timecard['csv_header'])
+        ):  # type: int
+            html_value_num: int = self._get_html_input_num(csv_col_num)
+            html_value: str = html_row_values[html_value_num]  \
+                if html_value_num < len(html_row_values) else ""
+            parsed_data: Optional[datetime] = None
+            if csv_col_num >= constants.timecard['num_cols_before_time']:
+                parsed_data = self._parse_time(html_value)
+            csv_row.append(
+                self._convert_into_time_format(parsed_data)
+                if parsed_data is not None else html_value
+            )
+        return csv_row
+
+
+class OracleTimeAndLabor(TimecardCsv, Browser):
     """Creates a new hourly timecard using a csv file as reference.
 
     Parameters
     ----------
         browser : str
-            Valid options are: "chrome", "edge", "firefox", "ie"
+            Valid options are: "chrome", "chromium", "edge", "firefox", "ie"
         driver_path : str, optional
-            File path to webdriver. Will look in PATH if not set.
+            File path to webdriver. Will look in PATH if not set. For
+            "chromium", this is the path to the Chromium binary instead.
         driver_wait_time : int, optional
             Amount of time in seconds to wait when locating elements before
             timing out in seconds.
@@ -51,9 +177,15 @@ class OracleTimeAndLabor(Browser):
         sso_password: Optional[str] = None
     ) -> None:
         super().__init__(browser, driver_path, default_wait_time)
+        metrics.count_driver_commands(self.driver)
         self._default_wait_time: int = default_wait_time
         self._sso_username: Optional[str] = sso_username
         self._sso_password: Optional[str] = sso_password
+        self._timecard_table: CachedTable = CachedTable(
+            browser=self,
+            tbody_xpath=constants.timecard['html']['table_tbody_xpath'],
+            num_header_rows=constants.timecard['html']['num_header_rows']
+        )
 
     @log_wrap(before_msg="Opening the Oracle E-Business Suite website")
     def open_oracle_ebusiness_suite(
@@ -108,6 +240,7 @@ class OracleTimeAndLabor(Browser):
                 )
 
     @log_wrap(before_msg="Navigating to recent timecards")
+    @metrics.observe_duration("navigation")
     def navigate_to_recent_timecards(self) -> None:
         """Navigates to Recent Timecards."""
         overtime_eligible_otl_link: Any = self.get_element_by_link_text(
@@ -124,6 +257,7 @@ class OracleTimeAndLabor(Browser):
         ))
 
     @log_wrap(before_msg="Creating a new timecard")
+    @metrics.observe_duration("create_timecard")
     def create_new_timecard(self) -> None:
         """Creates a new timecard."""
         create_timecard_button: Any = self.get_element_by_id(
@@ -139,47 +273,68 @@ class OracleTimeAndLabor(Browser):
         before_msg="Begin filling out timecard",
         after_msg="Finished filling out timecard"
     )
+    @metrics.observe_duration("fill")
     def fill_in_timecard_details(self, timecard_path: str) -> None:
         """Fills out the timecard with details from the csv file."""
         with open(timecard_path) as timecard_file:
             csv_reader: Iterator[List[str]] = csv.reader(timecard_file)
             # Discard the first row since it should only contain the header.
             next(csv_reader)
-            # This is the timecard site's table tbody XPath.
-            html_table_tbody_xpath: str =  \
-                constants.timecard['html']['table_tbody_xpath']
+            # The table is located once for this page, then reused.
+            self._timecard_table.invalidate()
             html_row_num: int = 0
             for csv_row_num, csv_row in enumerate(
                 csv_reader
             ):  # type: int, List[str]
-                current_html_row_inputs_list: List[Any] =  \
-                    self._get_list_of_html_inputs(
-                        self._get_html_row_xpath(
-                            html_row_num, html_table_tbody_xpath
-                        )
-                    )
                 if self._is_time_entered(csv_row):
-                    if len(current_html_row_inputs_list) == 0:
-                        self._add_html_row(
-                            html_table_tbody_xpath, html_row_num
-                        )
-                        current_html_row_inputs_list =   \
-                            self._get_list_of_html_inputs(
-                                self._get_html_row_xpath(
-                                    html_row_num, html_table_tbody_xpath
-                                )
-                            )
+                    if len(
+                        self._timecard_table.get_row_inputs(html_row_num)
+                    ) == 0:
+                        self._add_html_row(html_row_num)
                     self._fill_html_row(
-                        html_inputs_list=current_html_row_inputs_list,
-                        csv_row_data=self._row_data_generator(csv_row)
+                        html_row_num=html_row_num, csv_row=csv_row
                     )
                     html_row_num += 1
 
+    @log_wrap(
+        before_msg="Begin exporting recent timecards",
+        after_msg="Finished exporting recent timecards"
+    )
+    def export_recent_timecards(self, export_dir: str) -> None:
+        """Writes every recent timecard into its own csv file.
+
+        Expects Recent Timecards to be open. The files are laid out like
+        templates/timecard.csv so any of them can be reused as the timecard
+        file. They are numbered in the listed order and named after their
+        timecard's period. Each timecard is written out as soon as it has been
+        read, so the history is never held in memory.
+        """
+        os.makedirs(export_dir, exist_ok=True)
+        for timecard_num, (period, timecard_rows) in enumerate(
+            self._iter_recent_timecards_rows()
+        ):  # type: int, Tuple[str, List[List[str]]]
+            export_path: str = os.path.join(
+                export_dir, self._get_export_file_name(timecard_num, period)
+            )
+            with open(export_path, "w", newline="") as export_file:
+                csv_writer: Any = csv.writer(export_file)
+                csv_writer.writerow(constants.timecard['csv_header'])
+                csv_writer.writerows(timecard_rows)
+
     @log_wrap(before_msg="Logging into Oracle Single Sign On")
+    @metrics.observe_duration("login")
     def _login_oracle_sso(
         self, username: Optional[str] = None, password: Optional[str] = None
     ) -> None:
         """Logs into Oracle Single Sign On."""
+        if (
+            (username is None or password is None)
+            and getattr(self.driver, "headless", False) is True
+        ):
+            raise IncorrectLoginDetails(
+                "Headless Chromium has no window to type the login details "
+                "into. Please provide them in the secrets file."
+            )
         if username is not None:
             username_input: Any = self.get_element_by_id("sso_username")
             username_input.send_keys(username)
@@ -209,68 +364,17 @@ class OracleTimeAndLabor(Browser):
                     "Invalid login. Please check your username and password."
                 )
 
-    def _get_html_row_xpath(
-        self, html_row_num: int, html_table_tbody_xpath: str
-    ) -> str:
-        """Gets the timecard website's XPath for the HTML rows"""
-        # XPath is 1-indexed and the first row is the header, so we start at
-        # the 2nd tr.
-        return f"{html_table_tbody_xpath}/tr[{html_row_num + 2}]"
-
-    def _get_list_of_html_inputs(
-        self, current_html_row_xpath: str
-    ) -> List[Any]:
-        """Gets a list of inputs from the provided xpath."""
-        return self.get_elements_by_xpath(current_html_row_xpath + "//input")
-
-    def _row_data_generator(self, csv_row: List[str]) -> Iterator[str]:
-        """Iterates through the data within a row."""
-        row_len: int = len(csv_row)
-        current_col: int = 0
-        while current_col < row_len:
-            yield csv_row[current_col]
-            current_col += 1
-
-    def _is_time_entered(self, csv_row: List[str]) -> bool:
-        """Checks if there are any time entries within a csv row."""
-        row_len: int = len(csv_row)
-        is_time_entered: bool = False
-        for i in range(constants.timecard['num_cols_before_time'], row_len):
-            if csv_row[i] not in (None, ""):
-                is_time_entered = True
-                break
-        return is_time_entered
-
     @log_wrap(before_msg="Filling out HTML row")
-    def _fill_html_row(
-        self, html_inputs_list: List[Any], csv_row_data: Iterator[str]
-    ) -> None:
+    @metrics.observe_duration("fill_row")
+    def _fill_html_row(self, html_row_num: int, csv_row: List[str]) -> None:
         """Fills a row on the timecard website with data from the csv."""
-        for html_input_num, html_input in enumerate(
-            html_inputs_list
-        ):  # type: int, Any
-            # Get the data from the csv.
-            cell_data: Optional[str] = None
-            if (html_input_num < constants.timecard['num_cols_before_time']):
-                # The html and csv cols are still matching here.
-                cell_data = next(csv_row_data)
-            # The total csv columns and total html inputs don't match, so we
-            # have to ignore the html input for hours.
-            elif self._is_on_hours_html_input(html_input_num) is False:
-                data_to_be_checked: str = next(csv_row_data)
-                if data_to_be_checked in (None, ""):
-                    continue  # Empty cell, so continue
-                else:  # Not an empty cell
-                    parsed_data: Optional[datetime] = self._parse_time(
-                        data_to_be_checked
-                    )
-                    if parsed_data is not None:
-                        cell_data = self._convert_into_time_format(parsed_data)
-                    else:  # Could not parse data
-                        continue
-            else:  # self._is_on_hours_html_input(html_input_num) is True
-                continue
-
+        html_inputs_list: List[Any] =  \
+            self._wait_for_html_row_inputs(html_row_num)
+        for html_input_num, cell_data in self._html_input_data_generator(
+            csv_row
+        ):  # type: int, str
+            if html_input_num >= len(html_inputs_list):
+                break  # The row has no inputs for the rest of the csv cols.
             # Fill input with cell_data.
             is_entry_success: bool = False
             for current_wait_time in range(
@@ -278,20 +382,36 @@ class OracleTimeAndLabor(Browser):
                 self._default_wait_time,
                 constants.timecard['sleep_time']['wait_for_data_entry']
             ):
-                # Ensures the keys are sent, even with the website's heavy
-                # javascript validation.
-                html_input.clear()
-                html_input.send_keys(cell_data)
-                # Mandatory sleep after inputting data for the Project field,
-                # else there may be pop-ups when filling in the Task field.
-                if html_input_num == 0:
-                    # Trigger javascript by clicking away from current input.
-                    html_inputs_list[1].click()
-                    time.sleep(
-                        constants.timecard['sleep_time']['after_project_field']
+                html_input: Any = html_inputs_list[html_input_num]
+                try:
+                    # Ensures the keys are sent, even with the website's heavy
+                    # javascript validation.
+                    html_input.clear()
+                    html_input.send_keys(cell_data)
+                    # Mandatory sleep after inputting data for the Project
+                    # field, else there may be pop-ups when filling in the Task
+                    # field.
+                    if html_input_num == 0 and len(html_inputs_list) > 1:
+                        # Trigger javascript by clicking away from current
+                        # input.
+                        html_inputs_list[1].click()
+                        time.sleep(
+                            constants.timecard['sleep_time'][
+                                'after_project_field'
+                            ]
+                        )
+                    input_value: Optional[str] =  \
+                        html_input.get_attribute("value")
+                except StaleElementReferenceException:
+                    # The row was replaced by a partial page render, so locate
+                    # its inputs again once it is back and retry.
+                    self._timecard_table.invalidate()
+                    html_inputs_list = self._wait_for_html_row_inputs(
+                        html_row_num, num_html_inputs=len(html_inputs_list)
                     )
+                    input_value = None
                 if (
-                    html_input.get_attribute("value") != cell_data
+                    input_value != cell_data
                 ):
                     time.sleep(
                         constants.timecard['sleep_time']['wait_for_data_entry']
@@ -304,53 +424,35 @@ class OracleTimeAndLabor(Browser):
                     "Default wait time exceeded for data entry."
                 )
 
-    def _is_on_hours_html_input(self, html_input_num: int) -> bool:
-        """Checks if the html_input[html_input_num] is an input for hours."""
-        # Every third input is the input for hours.
-        return (
-            (html_input_num - constants.timecard['num_cols_before_time'])
-            % 3 == 2
-        )
-
-    def _parse_time(self, data: str) -> Optional[datetime]:
-        """Converts string into a datetime object."""
-        parsed_data: Optional[datetime] = None
-        # Accept these formats.
-        for time_format in ["%H:%M", "%I:%M:%S %p", "%I:%M %p", "%X"]:
-            try:
-                parsed_data = datetime.strptime(
-                    data, time_format
-                )
-                break
-            except (TypeError, ValueError):
-                pass
-        return parsed_data
+    def _wait_for_html_row_inputs(
+        self, html_row_num: int, num_html_inputs: int = 1
+    ) -> List[Any]:
+        """Waits until the row has at least num_html_inputs inputs.
 
-    def _convert_into_time_format(self, data: datetime) -> str:
-        """Converts datetime object to the website's accepted time format."""
-        return data.strftime("%H:%M")
+        The row is missing while a partial page render replaces the table.
+        """
+        return self.driver_default_wait.until(
+            lambda driver: (
+                len(self._timecard_table.get_row_inputs(html_row_num))
+                >= num_html_inputs
+                and self._timecard_table.get_row_inputs(html_row_num)
+            )
+        )
 
     @log_wrap(before_msg="Adding HTML row")
-    def _add_html_row(
-        self, html_table_tbody_xpath: str, current_html_row_num: int
-    ) -> None:
+    @metrics.observe_duration("row_add")
+    def _add_html_row(self, current_html_row_num: int) -> None:
         """Requests additional rows for input on the timecard website."""
-        add_row_button: Any = self.get_element_by_xpath(
-            html_table_tbody_xpath
-            + "//button[contains(., 'Add Another Row')]"
-        )
         # Wait a bit before clicking in case other things are still loading.
         time.sleep(
             constants.timecard['sleep_time']['before_adding_html_row']
         )
-        add_row_button.click()
+        self._click_add_row_button()
         # Wait until a new HTML row is added.
         current_add_row_wait_time: int = 0
         add_row_button_click_counter: int = 1
         while len(
-            self._get_list_of_html_inputs(self._get_html_row_xpath(
-                current_html_row_num, html_table_tbody_xpath
-            ))
+            self._timecard_table.get_row_inputs(current_html_row_num)
         ) == 0:
             self._raise_error_if_invalid_subtask()
             time.sleep(
@@ -363,13 +465,119 @@ class OracleTimeAndLabor(Browser):
                 add_row_button_click_counter == 1
                 and current_add_row_wait_time > self._default_wait_time * 0.5
             ):
-                add_row_button.click()
+                self._click_add_row_button()
                 add_row_button_click_counter += 1
             if current_add_row_wait_time > self._default_wait_time:
                 raise TimeoutError(
                     "Default wait time exceeded for adding HTML row."
                 )
 
+    def _click_add_row_button(self) -> None:
+        add_row_button_text: str =  \
+            constants.timecard['html']['add_row_button_text']
+        try:
+            self._timecard_table.get_button(add_row_button_text).click()
+        except StaleElementReferenceException:
+            # The table was rendered again since the button was cached.
+            self._timecard_table.invalidate()
+            self._timecard_table.get_button(add_row_button_text).click()
+
+    def _iter_recent_timecards_rows(
+        self
+    ) -> Iterator[Tuple[str, List[List[str]]]]:
+        """Yields each recent timecard's period and csv rows.
+
+        The details links of every page are gathered first so that each page
+        of Recent Timecards is loaded only once, then opened one by one.
+        """
+        for period, details_url in self._get_recent_timecards_details_urls(
+        ):  # type: str, str
+            self.get(details_url)
+            yield period, self._extract_timecard_rows()
+
+    @log_wrap(before_msg="Listing recent timecards")
+    def _get_recent_timecards_details_urls(self) -> List[Tuple[str, str]]:
+        """Gets the period and details url of every recent timecard."""
+        details_link_locator: Any = (
+            By.CSS_SELECTOR,
+            constants.timecard['html']['recent_timecards'][
+                'details_link_css_selector'
+            ]
+        )
+        details_urls: List[Tuple[str, str]] = []
+        if len(self.get_elements(details_link_locator)) == 0:
+            return details_urls  # No timecards have been made yet.
+        while True:
+            for details_link in self.get_elements(details_link_locator):
+                period: str = self._get_timecard_period(details_link)
+                # The property is the absolute url, unlike the attribute.
+                details_url: Optional[str] =  \
+                    details_link.get_property("href")
+                if (
+                    details_url is None
+                    or not details_url.startswith(("http://", "https://"))
+                    or details_url.endswith("#")
+                ):
+                    raise ElementNotFound(
+                        f"Could not find the details url of {period}."
+                    )
+                details_urls.append((period, details_url))
+            if self._click_next_page_of_recent_timecards() is False:
+                return details_urls
+
+    def _click_next_page_of_recent_timecards(self) -> bool:
+        """Pages forward, returning false if it is already the last page."""
+        recent_timecards: Dict =  \
+            constants.timecard['html']['recent_timecards']
+        details_link_locator: Any = (
+            By.CSS_SELECTOR, recent_timecards['details_link_css_selector']
+        )
+        next_page_links: List[Any] = self.get_elements_by_xpath(
+            recent_timecards['next_page_link_xpath']
+        )
+        if len(next_page_links) == 0:
+            return False
+        previous_details_links: List[Any] =  \
+            self.get_elements(details_link_locator)
+        next_page_links[0].click()
+        if len(previous_details_links) > 0:
+            self.driver_default_wait.until(
+                EC.staleness_of(previous_details_links[0])
+            )
+        self.get_element(details_link_locator)
+        return True
+
+    def _get_timecard_period(self, details_link: Any) -> str:
+        """Gets the period in the first cell of the timecard's listed row."""
+        period_cells: List[Any] = details_link.find_elements_by_xpath(
+            "./ancestor::tr[1]/td[1]"
+        )
+        return period_cells[0].text.strip() if len(period_cells) > 0 else ""
+
+    def _get_export_file_name(self, timecard_num: int, period: str) -> str:
+        """Numbers the file in the listed order and names it by period."""
+        # Dates such as 05-Oct-2020 - 11-Oct-2020 keep only safe characters.
+        safe_period: str = re.sub(r"[^\w-]+", "_", period).strip("_")
+        return "timecard_{num:03d}{period}.csv".format(
+            num=timecard_num + 1,
+            period=f"_{safe_period}" if safe_period != "" else ""
+        )
+
+    @log_wrap(before_msg="Reading timecard")
+    def _extract_timecard_rows(self) -> List[List[str]]:
+        """Reads the open timecard's rows as csv rows."""
+        extracted: Dict = self.driver_default_wait.until(
+            lambda driver: driver.execute_script(
+                _EXTRACT_TIMECARD_ROWS_JS,
+                constants.timecard['html']['table_tbody_xpath'],
+                constants.timecard['html']['num_header_rows']
+            )
+        )
+        return [
+            self._get_csv_row(html_row_values)
+            for html_row_values in extracted['rows']
+        ]
+
     def _raise_error_if_invalid_subtask(self) -> None:
         if (
             len(
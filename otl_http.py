@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import constants
+import metrics
+from http_extras.oa_page import HtmlNode, OaForm, OaPage
+from otl import TimecardCsv
+from selenium_extras.additional_exceptions import (
+    ElementNotFound, IncorrectLoginDetails, MaxTriesReached, SubtaskNotFound
+)
+from utils import log_wrap
+
+import csv
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+
+class OracleTimeAndLaborHttp(TimecardCsv):
+    """Experimental browserless version of OracleTimeAndLabor.
+
+    Replays the Oracle Applications Framework form posts a browser would make,
+    carrying each page's hidden form state and event parameters over a pooled
+    HTTP session. Since the session's transaction ends with the program, the
+    filled timecard is saved as a draft, but like the browser version, it
+    stops short of submitting the timecard.
+
+    Only the typed text of each input is posted. The list of values
+    validation that a browser triggers on leaving the Project field is not
+    replayed, so any hidden ids that the validation would fill in keep their
+    initial values until the draft is opened and validated in a browser.
+
+    Parameters
+    ----------
+        default_wait_time : int, optional
+            Amount of time in seconds to wait for each HTTP response before
+            timing out.
+        sso_username : str, optional
+            Oracle SSO username. Required since there is no login screen.
+        sso_password : str, optional
+            Oracle SSO password. Required since there is no login screen.
+        urls : dict, optional
+            Oracle urls keyed like constants.urls['oracle']. Can point to a
+            mock E-Business Suite server.
+
+    Attributes
+    ----------
+        session : requests.Session
+            Session holding the cookies and the kept-alive connections.
+        page : OaPage
+            The most recently fetched page.
+    """
+
+    def __init__(
+        self,
+        default_wait_time: int = 60,
+        sso_username: Optional[str] = None,
+        sso_password: Optional[str] = None,
+        urls: Dict = constants.urls['oracle']
+    ) -> None:
+        self._default_wait_time: int = default_wait_time
+        self._sso_username: Optional[str] = sso_username
+        self._sso_password: Optional[str] = sso_password
+        self._urls: Dict = urls
+        self.session: requests.Session = requests.Session()
+        self.session.headers['User-Agent'] = constants.http['user_agent']
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_maxsize=constants.http['pool_maxsize']
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.page: Optional[OaPage] = None
+        self._html_table_tbody_cache: Tuple[Optional[OaPage], List] = (
+            None, []
+        )
+
+    @log_wrap(before_msg="Opening the Oracle E-Business Suite website")
+    def open_oracle_ebusiness_suite(
+        self,
+        current_try: int = 1,
+        max_tries: int = constants.max_tries['open_oracle_ebusiness_suite']
+    ) -> None:
+        """Opens the Oracle E-Business Suite website."""
+        self.page = self._get(self._urls['ebusiness'])
+        if self.page.url.startswith(self._urls['single_sign_on']):
+            self._login_oracle_sso(self._sso_username, self._sso_password)
+        if self._urls['ebusiness_no_query_parameters'] in self.page.url:
+            pass  # Goal of this function reached.
+        elif current_try < max_tries:
+            # Retry.
+            self.open_oracle_ebusiness_suite(current_try+1)
+        elif current_try >= max_tries:
+            raise MaxTriesReached(
+                "Too many attempts to open the Oracle E-Business Suite "
+                "have been made."
+            )
+
+    @log_wrap(before_msg="Navigating to recent timecards")
+    @metrics.observe_duration("navigation")
+    def navigate_to_recent_timecards(self) -> None:
+        """Navigates to Recent Timecards."""
+        self.page = self._click(self._get_link(
+            "US OTL - Emps Eligible for Overtime (Project Accounting)"
+        ))
+        self.page = self._click(self._get_link("Recent Timecards"))
+
+    @log_wrap(before_msg="Creating a new timecard")
+    @metrics.observe_duration("create_timecard")
+    def create_new_timecard(self) -> None:
+        """Creates a new timecard."""
+        create_timecard_button: Optional[HtmlNode] =  \
+            self.page.get_element_by_id("Hxccreatetcbutton")
+        if create_timecard_button is None:
+            raise ElementNotFound("Could not find the Create Timecard button.")
+        self.page = self._click(create_timecard_button)
+
+    @log_wrap(
+        before_msg="Begin filling out timecard",
+        after_msg="Finished filling out timecard"
+    )
+    @metrics.observe_duration("fill")
+    def fill_in_timecard_details(self, timecard_path: str) -> None:
+        """Fills out the timecard with details from the csv file.
+
+        All of the rows are posted back together with the Save event in one
+        request, so the draft can be reviewed and submitted from Recent
+        Timecards.
+        """
+        with open(timecard_path) as timecard_file:
+            csv_reader: Iterator[List[str]] = csv.reader(timecard_file)
+            # Discard the first row since it should only contain the header.
+            next(csv_reader)
+            csv_rows: List[List[str]] = [
+                csv_row for csv_row in csv_reader
+                if self._is_time_entered(csv_row)
+            ]
+        self._add_html_rows(len(csv_rows))
+        form: OaForm = self._get_timecard_form()
+        for html_row_num, csv_row in enumerate(
+            csv_rows
+        ):  # type: int, List[str]
+            form.fields.update(self._get_html_row_values(
+                html_inputs_list=self._get_list_of_html_inputs(html_row_num),
+                csv_row=csv_row
+            ))
+        self.page = self._click(self._get_save_button(), form=form)
+        self._raise_error_if_invalid_subtask()
+
+    def close(self) -> None:
+        self.session.close()
+
+    @log_wrap(before_msg="Logging into Oracle Single Sign On")
+    @metrics.observe_duration("login")
+    def _login_oracle_sso(
+        self, username: Optional[str] = None, password: Optional[str] = None
+    ) -> None:
+        """Logs into Oracle Single Sign On."""
+        if username is None or password is None:
+            raise IncorrectLoginDetails(
+                "The browserless mode needs the username and password from "
+                "the secrets file."
+            )
+        username_input: Optional[HtmlNode] =  \
+            self.page.get_element_by_id("sso_username")
+        password_input: Optional[HtmlNode] =  \
+            self.page.get_element_by_id("ssopassword")
+        if username_input is None or password_input is None:
+            raise ElementNotFound("Could not find the SSO login inputs.")
+        form: Optional[OaForm] = self.page.get_form_of(username_input)
+        if form is None:
+            raise ElementNotFound("Could not find the SSO login form.")
+        form.fields[username_input.attrs.get("name", "ssousername")] =  \
+            username
+        form.fields[password_input.attrs.get("name", "password")] = password
+        self.page = self._post_form(form)
+        self._follow_auto_submit_forms()
+        if (
+            self.page.url.startswith(self._urls['single_sign_on'])
+            or self.page.url.startswith(self._urls['single_sign_on_hiccup'])
+        ):
+            raise IncorrectLoginDetails(
+                "Invalid login. Please check your username and password."
+            )
+
+    def _follow_auto_submit_forms(
+        self,
+        max_tries: int = constants.max_tries['follow_auto_submit_form']
+    ) -> None:
+        """Posts the forms that the SSO pages submit with javascript onload."""
+        for _ in range(max_tries):
+            forms: List[OaForm] = self.page.get_forms()
+            scripts: str = "".join(
+                node.get_text() if node.tag == "script"
+                else node.attrs.get("onload", "")
+                for node in self.page.root.iter_descendants()
+                if node.tag in ("script", "body")
+            )
+            if len(forms) != 1 or ".submit()" not in scripts:
+                return
+            self.page = self._post_form(forms[0])
+
+    def _get(self, url: str) -> OaPage:
+        response: requests.Response = self.session.get(
+            url, timeout=self._default_wait_time
+        )
+        response.raise_for_status()
+        return OaPage(response.url, response.text)
+
+    def _post_form(
+        self, form: OaForm, event_params: Optional[Dict] = None
+    ) -> OaPage:
+        """Posts the form's current state back along with the event."""
+        payload: Dict = form.get_payload(event_params)
+        if form.method == "GET":
+            response: requests.Response = self.session.get(
+                form.action, params=payload, timeout=self._default_wait_time
+            )
+        else:
+            response = self.session.post(
+                form.action, data=payload, timeout=self._default_wait_time
+            )
+        response.raise_for_status()
+        return OaPage(response.url, response.text)
+
+    def _click(
+        self, node: HtmlNode, form: Optional[OaForm] = None
+    ) -> OaPage:
+        """Does what clicking the link or button would do in a browser.
+
+        Posts the given form, such as one with filled in fields, instead of
+        the node's form as it was fetched.
+        """
+        form_name, event_params = self.page.get_submit_form_params(
+            node
+        )  # type: str, Dict
+        if form_name == "" and node.tag == "a":
+            return self._get(urljoin(self.page.url, node.attrs["href"]))
+        if form is None:
+            form = next(
+                (
+                    page_form for page_form in self.page.get_forms()
+                    if form_name != "" and page_form.name == form_name
+                ),
+                self.page.get_form_of(node)
+            )
+        if form is None:
+            raise ElementNotFound(f"Could not find the form for {node.tag}.")
+        if form_name == "" and "name" in node.attrs:
+            # A plain submit button only sends itself when clicked.
+            event_params = {node.attrs["name"]: node.attrs.get("value", "")}
+        return self._post_form(form, event_params)
+
+    def _get_link(self, link_text: str) -> HtmlNode:
+        links: List[HtmlNode] = self.page.get_elements_by_link_text(link_text)
+        if len(links) == 0:
+            raise ElementNotFound(f"Could not find the {link_text} link.")
+        return links[0]
+
+    def _get_save_button(self) -> HtmlNode:
+        save_buttons: List[HtmlNode] = self.page.get_elements_by_xpath(
+            "//button[contains(., '{text}')]".format(
+                text=constants.timecard['html']['save_button_text']
+            )
+        )
+        if len(save_buttons) == 0:
+            raise ElementNotFound("Could not find the Save button.")
+        return save_buttons[0]
+
+    def _get_html_table_tbody(self) -> List[HtmlNode]:
+        """Gets the timecard's tbody, located once per fetched page."""
+        cached_page, html_table_tbody = self._html_table_tbody_cache
+        if cached_page is not self.page:
+            html_table_tbody = self.page.get_elements_by_xpath(
+                constants.timecard['html']['table_tbody_xpath']
+            )
+            self._html_table_tbody_cache = (self.page, html_table_tbody)
+        return html_table_tbody
+
+    def _get_timecard_form(self) -> OaForm:
+        html_table_tbody: List[HtmlNode] = self._get_html_table_tbody()
+        form: Optional[OaForm] = None
+        if len(html_table_tbody) > 0:
+            form = self.page.get_form_of(html_table_tbody[0])
+        if form is None:
+            raise ElementNotFound("Could not find the timecard form.")
+        return form
+
+    def _get_list_of_html_inputs(self, html_row_num: int) -> List[HtmlNode]:
+        """Gets a list of inputs within the timecard's HTML row."""
+        html_table_tbody: List[HtmlNode] = self._get_html_table_tbody()
+        if len(html_table_tbody) == 0:
+            return []
+        # XPath is 1-indexed and starts after the header rows.
+        html_tr_num: int =  \
+            html_row_num + constants.timecard['html']['num_header_rows'] + 1
+        return self.page.get_elements_by_xpath(
+            f"/tr[{html_tr_num}]//input", context=html_table_tbody[0]
+        )
+
+    def _get_html_row_values(
+        self, html_inputs_list: List[HtmlNode], csv_row: List[str]
+    ) -> Iterator[Tuple[str, str]]:
+        """Pairs the row's input names with their data from the csv."""
+        for html_input_num, cell_data in self._html_input_data_generator(
+            csv_row
+        ):  # type: int, str
+            if html_input_num >= len(html_inputs_list):
+                break  # The row has no inputs for the rest of the csv cols.
+            html_input: HtmlNode = html_inputs_list[html_input_num]
+            if "name" in html_input.attrs:
+                yield html_input.attrs["name"], cell_data
+
+    @log_wrap(before_msg="Adding HTML rows")
+    @metrics.observe_duration("row_add")
+    def _add_html_rows(
+        self,
+        num_html_rows: int,
+        max_tries: int = constants.max_tries['add_html_row']
+    ) -> None:
+        """Requests rows until the timecard has num_html_rows of them."""
+        current_try: int = 1
+        current_num_html_rows: int = self._count_html_rows()
+        while current_num_html_rows < num_html_rows:
+            add_row_buttons: List[HtmlNode] = [
+                button
+                for html_table_tbody in self._get_html_table_tbody()
+                for button in self.page.get_elements_by_xpath(
+                    "//button[contains(., '{text}')]".format(
+                        text=constants.timecard['html']['add_row_button_text']
+                    ),
+                    context=html_table_tbody
+                )
+            ]
+            if len(add_row_buttons) == 0:
+                raise ElementNotFound(
+                    "Could not find the Add Another Row button."
+                )
+            self.page = self._click(add_row_buttons[0])
+            self._raise_error_if_invalid_subtask()
+            previous_num_html_rows: int = current_num_html_rows
+            current_num_html_rows = self._count_html_rows()
+            if current_num_html_rows > previous_num_html_rows:
+                current_try = 1
+            elif current_try < max_tries:
+                current_try += 1
+            else:
+                raise MaxTriesReached(
+                    "Too many attempts to add an HTML row have been made."
+                )
+
+    def _count_html_rows(self) -> int:
+        html_row_num: int = 0
+        while len(self._get_list_of_html_inputs(html_row_num)) > 0:
+            html_row_num += 1
+        return html_row_num
+
+    def _raise_error_if_invalid_subtask(self) -> None:
+        if (
+            len(
+                self.page.get_elements_by_xpath(
+                    "//h1[contains(text(), 'Error')]"
+                )
+            ) > 0
+            and len(self.page.get_elements_by_link_text("Task")) > 0
+            and len(
+                self.page.get_elements_by_xpath(
+                    "//div[contains(text(), 'Select a valid value.')]"
+                )
+            ) > 0
+        ):
+            raise SubtaskNotFound(
+                "Please check if the offending subtask exists."
+            )
@@ -20,4 +20,9 @@ class MaxTriesReached(Error):
 
 class SubtaskNotFound(Error):
     """Raised when a line item's subtask is not found."""
+    pass
+
+
+class ElementNotFound(Error):
+    """Raised when an expected element is missing from a fetched page."""
     pass
\ No newline at end of file
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from typing import Any, Callable, Dict, List, Optional
+
+
+class CachedTable():
+    """Handle to a table body that is located once and then queried within.
+
+    The tbody, its rows' inputs, and its buttons are cached. Everything is
+    invalidated and located again only once a cached element turns out to be
+    stale, such as after a partial page render replaces the table. Drivers
+    that keep looked up elements alive in the page, such as the
+    ChromiumDevToolsDriver, release them whenever the cache is invalidated.
+
+    Parameters
+    ----------
+        browser : selenium_extras.wrapper.Browser
+            Browser the table is displayed in.
+        tbody_xpath : str
+            XPath of the tbody.
+        num_header_rows : int, optional
+            Number of rows at the top of the tbody that have no inputs.
+    """
+
+    def __init__(
+        self,
+        browser: Any,
+        tbody_xpath: str,
+        num_header_rows: int = 1
+    ) -> None:
+        self._browser: Any = browser
+        self._tbody_xpath: str = tbody_xpath
+        self._num_header_rows: int = num_header_rows
+        self._tbody: Optional[Any] = None
+        self._row_inputs: Dict[int, List[Any]] = {}
+        self._buttons: Dict[str, Any] = {}
+
+    def get_row_inputs(self, row_num: int) -> List[Any]:
+        """Gets the inputs within a row, counting from the first data row.
+
+        Returns an empty list if the row has not been rendered yet. Empty rows
+        are not cached so that they can be polled for.
+        """
+        if row_num in self._row_inputs:
+            return self._row_inputs[row_num]
+        # XPath is 1-indexed and starts after the header rows.
+        row_inputs: List[Any] = self._query(
+            lambda tbody: tbody.find_elements_by_xpath(
+                f"./tr[{row_num + self._num_header_rows + 1}]//input"
+            )
+        )
+        if len(row_inputs) > 0:
+            self._row_inputs[row_num] = row_inputs
+        return row_inputs
+
+    def get_button(self, text: str) -> Any:
+        """Gets the visible button within the table with the specified text."""
+        if text not in self._buttons:
+            self._buttons[text] = self._browser.driver_default_wait.until(
+                lambda driver: self._get_visible_button(text)
+            )
+        return self._buttons[text]
+
+    def invalidate(self) -> None:
+        """Forgets every cached element so they are located again."""
+        self._tbody = None
+        self._row_inputs = {}
+        self._buttons = {}
+        release_elements: Optional[Callable] = getattr(
+            self._browser.driver, "release_elements", None
+        )
+        if release_elements is not None:
+            release_elements()
+
+    def _get_tbody(self) -> Any:
+        if self._tbody is None:
+            self._tbody = self._browser.get_element_by_xpath(
+                self._tbody_xpath
+            )
+        return self._tbody
+
+    def _get_visible_button(self, text: str) -> Any:
+        buttons: List[Any] = self._query(
+            lambda tbody: tbody.find_elements_by_xpath(
+                f".//button[contains(., '{text}')]"
+            )
+        )
+        try:
+            for button in buttons:
+                if button.is_displayed():
+                    return button
+        except StaleElementReferenceException:
+            self.invalidate()
+        return False
+
+    def _query(self, query: Callable) -> Any:
+        """Runs the query on the tbody, locating it again if it went stale."""
+        try:
+            return query(self._get_tbody())
+        except StaleElementReferenceException:
+            self.invalidate()
+            return query(self._get_tbody())
@@ -0,0 +1,936 @@
+from __future__ import annotations
+
+from selenium.common.exceptions import (
+    InvalidSelectorException, NoSuchElementException,
+    StaleElementReferenceException, TimeoutException, WebDriverException
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+
+import base64
+import itertools
+import json
+import os
+import shutil
+import socket
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+from urllib.parse import urlparse
+
+
+# Executed with the search root as `this`. Mirrors the selenium locator
+# strategies used by the Browser wrapper.
+_FIND_ELEMENTS_JS: str = """
+function(by, value) {
+    const root = (this && this.nodeType) ? this : document;
+    const doc = root.ownerDocument || root;
+    const byLinkText = (isPartial) => Array.from(
+        root.querySelectorAll('a')
+    ).filter((link) => {
+        const text = link.innerText.trim();
+        return isPartial ? text.includes(value) : text === value;
+    });
+    switch (by) {
+        case 'id':
+            return Array.from(
+                root.querySelectorAll('[id="' + CSS.escape(value) + '"]')
+            );
+        case 'name':
+            return Array.from(
+                root.querySelectorAll('[name="' + CSS.escape(value) + '"]')
+            );
+        case 'xpath': {
+            const snapshot = doc.evaluate(
+                value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE,
+                null
+            );
+            const elements = [];
+            for (let i = 0; i < snapshot.snapshotLength; i++) {
+                elements.push(snapshot.snapshotItem(i));
+            }
+            return elements;
+        }
+        case 'link text':
+            return byLinkText(false);
+        case 'partial link text':
+            return byLinkText(true);
+        case 'tag name':
+            return Array.from(root.getElementsByTagName(value));
+        case 'class name':
+            return Array.from(root.getElementsByClassName(value));
+        case 'css selector':
+            return Array.from(root.querySelectorAll(value));
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+"""
+
+_IS_DISPLAYED_JS: str = """
+function() {
+    const style = window.getComputedStyle(this);
+    return (
+        this.isConnected
+        && style.visibility !== 'hidden'
+        && style.display !== 'none'
+        && this.getClientRects().length > 0
+    );
+}
+"""
+
+_GET_ATTRIBUTE_JS: str = """
+function(name) {
+    if (['value', 'checked', 'selected'].includes(name) && name in this) {
+        const property = this[name];
+        if (typeof property === 'boolean') {
+            return property ? 'true' : null;
+        }
+        return property === null ? null : String(property);
+    }
+    if (this.hasAttribute(name)) {
+        return this.getAttribute(name);
+    }
+    const property = this[name];
+    if (property === undefined || property === null) {
+        return null;
+    }
+    return typeof property === 'object' ? null : String(property);
+}
+"""
+
+_CLEAR_JS: str = """
+function() {
+    this.focus();
+    this.value = '';
+    this.dispatchEvent(new Event('input', {bubbles: true}));
+    this.dispatchEvent(new Event('change', {bubbles: true}));
+}
+"""
+
+_CLICK_POINT_JS: str = """
+function() {
+    this.scrollIntoView({block: 'center', inline: 'center'});
+    const rect = this.getBoundingClientRect();
+    return [rect.left + rect.width / 2, rect.top + rect.height / 2];
+}
+"""
+
+# Special selenium keys that are sent as key events instead of inserted text.
+_KEY_EVENTS: Dict[str, Dict] = {
+    Keys.RETURN: {'key': 'Enter', 'code': 'Enter', 'text': '\r',
+                  'windowsVirtualKeyCode': 13},
+    Keys.ENTER: {'key': 'Enter', 'code': 'Enter', 'text': '\r',
+                 'windowsVirtualKeyCode': 13},
+    Keys.TAB: {'key': 'Tab', 'code': 'Tab', 'windowsVirtualKeyCode': 9},
+    Keys.BACKSPACE: {'key': 'Backspace', 'code': 'Backspace',
+                     'windowsVirtualKeyCode': 8}
+}
+
+# Thrown by element functions once a partial page render removes the element.
+_DETACHED_ELEMENT_ERROR: str = "Element is no longer attached to the DOM"
+
+_STALE_OBJECT_ERRORS: List[str] = [
+    _DETACHED_ELEMENT_ERROR,
+    "Could not find object with given id",
+    "Cannot find context with specified id",
+    "Node with given id does not belong to the document"
+]
+
+
+class DevToolsConnection():
+    """Minimal Chrome DevTools Protocol client over a websocket.
+
+    Responses are matched to their commands by id, while events are pushed to
+    the registered listeners from a background reader thread.
+
+    Parameters
+    ----------
+        websocket_url : str
+            The browser's ws:// debugger url.
+        command_timeout : int, optional
+            Amount of time in seconds to wait for a command's response.
+    """
+
+    def __init__(self, websocket_url: str, command_timeout: int = 60) -> None:
+        self._command_timeout: int = command_timeout
+        self._socket: socket.socket = self._open_websocket(websocket_url)
+        self._send_lock: threading.Lock = threading.Lock()
+        self._condition: threading.Condition = threading.Condition()
+        self._ids: Iterator[int] = itertools.count(1)
+        self._responses: Dict[int, Dict] = {}
+        self._listeners: Dict[str, List[Callable]] = {}
+        self._event_count: int = 0
+        self._is_closed: bool = False
+        self._reader: threading.Thread = threading.Thread(
+            target=self._read_messages, daemon=True
+        )
+        self._reader.start()
+
+    def send(
+        self,
+        method: str,
+        params: Optional[Dict] = None,
+        session_id: Optional[str] = None
+    ) -> Dict:
+        """Sends a command and blocks until its response arrives."""
+        message_id: int = next(self._ids)
+        message: Dict = {'id': message_id, 'method': method}
+        if params is not None:
+            message['params'] = params
+        if session_id is not None:
+            message['sessionId'] = session_id
+        self._send_frame(json.dumps(message).encode('utf-8'))
+        with self._condition:
+            is_answered: bool = self._condition.wait_for(
+                lambda: message_id in self._responses or self._is_closed,
+                timeout=self._command_timeout
+            )
+            response: Optional[Dict] = self._responses.pop(message_id, None)
+        if response is None:
+            raise WebDriverException(
+                f"No response to {method}: "
+                + ("connection closed." if is_answered else "timed out.")
+            )
+        if 'error' in response:
+            raise WebDriverException(
+                f"{method} failed: {response['error'].get('message')}"
+            )
+        return response.get('result', {})
+
+    def add_listener(self, method: str, callback: Callable) -> None:
+        """Registers a callback for an event, called with the event params.
+
+        Callbacks run on the reader thread, so they must not send commands.
+        """
+        self._listeners.setdefault(method, []).append(callback)
+
+    def wait_for_event(self, timeout: float) -> bool:
+        """Blocks until any event is received or the timeout is reached."""
+        with self._condition:
+            event_count: int = self._event_count
+            return self._condition.wait_for(
+                lambda: self._event_count != event_count or self._is_closed,
+                timeout=timeout
+            )
+
+    def close(self) -> None:
+        try:
+            self._send_frame(b"", opcode=0x8)
+        except OSError:
+            pass
+        self._socket.close()
+
+    def _open_websocket(self, websocket_url: str) -> socket.socket:
+        """Opens the socket and performs the websocket handshake."""
+        parsed_url: Any = urlparse(websocket_url)
+        sock: socket.socket = socket.create_connection(
+            (parsed_url.hostname, parsed_url.port or 80),
+            timeout=self._command_timeout
+        )
+        key: str = base64.b64encode(os.urandom(16)).decode('ascii')
+        sock.sendall((
+            f"GET {parsed_url.path} HTTP/1.1\r\n"
+            f"Host: {parsed_url.hostname}:{parsed_url.port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode('ascii'))
+        handshake: bytes = b""
+        while b"\r\n\r\n" not in handshake:
+            chunk: bytes = sock.recv(1024)
+            if chunk == b"":
+                raise WebDriverException("DevTools handshake was cut off.")
+            handshake += chunk
+        if b" 101 " not in handshake.split(b"\r\n", 1)[0]:
+            raise WebDriverException(
+                "DevTools refused the websocket upgrade: "
+                + handshake.split(b"\r\n", 1)[0].decode('latin-1')
+            )
+        # The reader thread blocks until a frame arrives.
+        sock.settimeout(None)
+        return sock
+
+    def _send_frame(self, payload: bytes, opcode: int = 0x1) -> None:
+        """Sends a single masked websocket frame."""
+        header: bytes = bytes([0x80 | opcode])
+        payload_len: int = len(payload)
+        if payload_len < 126:
+            header += bytes([0x80 | payload_len])
+        elif payload_len < (1 << 16):
+            header += bytes([0x80 | 126]) + struct.pack("!H", payload_len)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack("!Q", payload_len)
+        mask: bytes = os.urandom(4)
+        masked_payload: bytes = bytes(
+            byte ^ mask[i % 4] for i, byte in enumerate(payload)
+        )
+        with self._send_lock:
+            self._socket.sendall(header + mask + masked_payload)
+
+    def _recv_exactly(self, num_bytes: int) -> bytes:
+        data: bytes = b""
+        while len(data) < num_bytes:
+            chunk: bytes = self._socket.recv(num_bytes - len(data))
+            if chunk == b"":
+                raise ConnectionError("DevTools websocket closed.")
+            data += chunk
+        return data
+
+    def _recv_message(self) -> Optional[bytes]:
+        """Receives a full message, answering pings along the way."""
+        message: bytes = b""
+        while True:
+            first_byte, second_byte = self._recv_exactly(2)
+            opcode: int = first_byte & 0x0F
+            payload_len: int = second_byte & 0x7F
+            if payload_len == 126:
+                payload_len = struct.unpack("!H", self._recv_exactly(2))[0]
+            elif payload_len == 127:
+                payload_len = struct.unpack("!Q", self._recv_exactly(8))[0]
+            # Server frames are never masked.
+            payload: bytes = self._recv_exactly(payload_len)
+            if opcode == 0x8:  # Close
+                return None
+            elif opcode == 0x9:  # Ping
+                self._send_frame(payload, opcode=0xA)
+                continue
+            elif opcode == 0xA:  # Pong
+                continue
+            message += payload
+            if first_byte & 0x80:  # FIN
+                return message
+
+    def _read_messages(self) -> None:
+        """Dispatches responses and events until the connection closes."""
+        try:
+            while True:
+                raw_message: Optional[bytes] = self._recv_message()
+                if raw_message is None:
+                    break
+                message: Dict = json.loads(raw_message)
+                if 'id' in message:
+                    with self._condition:
+                        self._responses[message['id']] = message
+                        self._condition.notify_all()
+                    continue
+                for callback in self._listeners.get(message.get('method'), []):
+                    callback(message.get('params', {}))
+                with self._condition:
+                    self._event_count += 1
+                    self._condition.notify_all()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            with self._condition:
+                self._is_closed = True
+                self._condition.notify_all()
+
+
+class ChromiumDevToolsDriver():
+    """Drives a local Chromium directly through the DevTools Protocol.
+
+    Implements the subset of the selenium webdriver interface used by the
+    Browser wrapper, so that it can be swapped in for a webdriver. Elements are
+    looked up and edited with Runtime and DOM commands, and navigation state is
+    tracked from pushed Page events instead of being polled.
+
+    Parameters
+    ----------
+        binary_path : str, optional
+            File path to the Chromium binary. Will look in PATH if not set.
+        headless : bool, optional
+            Runs Chromium without a window if true.
+        page_load_timeout : int, optional
+            Amount of time in seconds to wait for a page load event.
+        network_idle_timeout : int, optional
+            Amount of time in seconds to additionally wait for the network to
+            go idle after a page load.
+
+    Attributes
+    ----------
+        current_url : str
+            The main frame's url, as of the last navigation event.
+        headless : bool
+            Whether Chromium runs without a window.
+    """
+
+    _binary_names: List[str] = [
+        "chromium", "chromium-browser", "google-chrome", "chrome"
+    ]
+    # Remote objects handed out as elements, released with release_elements.
+    _object_group: str = "otl_elements"
+
+    def __init__(
+        self,
+        binary_path: Optional[str] = None,
+        headless: bool = True,
+        page_load_timeout: int = 300,
+        network_idle_timeout: int = 5
+    ) -> None:
+        self.headless: bool = headless
+        self.page_load_timeout: int = page_load_timeout
+        self.network_idle_timeout: int = network_idle_timeout
+        self.current_url: str = "about:blank"
+        self._main_frame_id: Optional[str] = None
+        self._loader_lifecycles: Dict[str, Set[str]] = {}
+        self._latest_loader_id: Optional[str] = None
+        self._user_data_dir: str = tempfile.mkdtemp(prefix="otl_chromium_")
+        self._process: Optional[subprocess.Popen] = None
+        self._connection: Optional[DevToolsConnection] = None
+        try:
+            self._process = self._launch_chromium(binary_path, headless)
+            self._connection = DevToolsConnection(
+                self._get_browser_websocket_url()
+            )
+            target_id: str = self._connection.send(
+                "Target.createTarget", {'url': "about:blank"}
+            )['targetId']
+            self._session_id: str = self._connection.send(
+                "Target.attachToTarget",
+                {'targetId': target_id, 'flatten': True}
+            )['sessionId']
+            self._target_id: str = target_id
+            self._connection.add_listener(
+                "Page.frameNavigated", self._on_frame_navigated
+            )
+            self._connection.add_listener(
+                "Page.navigatedWithinDocument",
+                self._on_navigated_within_document
+            )
+            self._connection.add_listener(
+                "Page.lifecycleEvent", self._on_lifecycle_event
+            )
+            self.send("Page.enable")
+            self.send("Runtime.enable")
+            self.send("Page.setLifecycleEventsEnabled", {'enabled': True})
+            frame: Dict =  \
+                self.send("Page.getFrameTree")['frameTree']['frame']
+            self._main_frame_id = frame['id']
+            self._latest_loader_id = frame['loaderId']
+            self.current_url = frame['url']
+        except BaseException:
+            # Leave no Chromium process or profile behind.
+            self.quit()
+            raise
+
+    def send(self, method: str, params: Optional[Dict] = None) -> Dict:
+        """Sends a DevTools command to the page's session."""
+        return self._connection.send(method, params, self._session_id)
+
+    def wait_for_event(self, timeout: float) -> bool:
+        """Blocks until the browser pushes any event or the timeout is hit."""
+        return self._connection.wait_for_event(timeout)
+
+    def get(self, url: str) -> None:
+        """Navigates and waits for the load event, then for network idle."""
+        previous_loader_id: Optional[str] = self._latest_loader_id
+        result: Dict = self.send("Page.navigate", {'url': url})
+        if result.get('errorText'):
+            raise WebDriverException(
+                f"Navigation to {url} failed: {result['errorText']}"
+            )
+        if result.get('loaderId') is None:
+            return  # Same-document navigation, so there is no load event.
+        self._wait_for_lifecycle(
+            previous_loader_id, "load", self.page_load_timeout
+        )
+        try:
+            self._wait_for_lifecycle(
+                previous_loader_id, "networkIdle", self.network_idle_timeout
+            )
+        except TimeoutException:
+            pass  # Long polling pages never go idle.
+
+    def find_element(
+        self, by: str = By.ID, value: Optional[str] = None
+    ) -> Any:
+        return _first_element(self.find_elements(by, value), by, value)
+
+    def find_elements(
+        self, by: str = By.ID, value: Optional[str] = None
+    ) -> List[DevToolsElement]:
+        result: Dict = self.send("Runtime.evaluate", {
+            'expression': "({function}).call(document, {by}, {value})".format(
+                function=_FIND_ELEMENTS_JS,
+                by=json.dumps(by),
+                value=json.dumps(value)
+            ),
+            'objectGroup': self._object_group,
+            'returnByValue': False
+        })
+        return self._to_elements(result)
+
+    def find_element_by_id(self, id: str) -> Any:
+        return self.find_element(By.ID, id)
+
+    def find_element_by_link_text(self, link_text: str) -> Any:
+        return self.find_element(By.LINK_TEXT, link_text)
+
+    def find_element_by_xpath(self, xpath: str) -> Any:
+        return self.find_element(By.XPATH, xpath)
+
+    def find_elements_by_link_text(self, link_text: str) -> List[Any]:
+        return self.find_elements(By.LINK_TEXT, link_text)
+
+    def find_elements_by_xpath(self, xpath: str) -> List[Any]:
+        return self.find_elements(By.XPATH, xpath)
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        """Runs the script as a function body with the given arguments."""
+        window_object_id: str = self.send("Runtime.evaluate", {
+            'expression': "window", 'objectGroup': self._object_group
+        })['result']['objectId']
+        try:
+            result: Dict = self.send("Runtime.callFunctionOn", {
+                'functionDeclaration': f"function() {{\n{script}\n}}",
+                'objectId': window_object_id,
+                'arguments': [
+                    {'objectId': arg.object_id}
+                    if isinstance(arg, DevToolsElement) else {'value': arg}
+                    for arg in args
+                ],
+                'objectGroup': self._object_group,
+                'awaitPromise': True
+            })
+        finally:
+            self._release_object(window_object_id)
+        self._raise_if_script_failed(result)
+        value: Any = self._to_python(result['result'])
+        if (
+            'objectId' in result['result']
+            and result['result'].get('subtype') != "node"
+        ):
+            # Only the elements within the result are still referenced.
+            self._release_object(result['result']['objectId'])
+        return value
+
+    def release_elements(self) -> None:
+        """Releases every element handed out so far, which makes them stale.
+
+        The page keeps every looked up element alive until it navigates away,
+        so pages that are only partially rendered again, such as the timecard
+        page, should release the elements they no longer need.
+        """
+        try:
+            self.send(
+                "Runtime.releaseObjectGroup",
+                {'objectGroup': self._object_group}
+            )
+        except WebDriverException:
+            pass  # The context is already gone after a navigation.
+
+    def close(self) -> None:
+        """Closes the page, then shuts down Chromium."""
+        try:
+            self._connection.send(
+                "Target.closeTarget", {'targetId': self._target_id}
+            )
+        except WebDriverException:
+            pass
+        self.quit()
+
+    def quit(self) -> None:
+        """Shuts down Chromium and removes its temporary profile."""
+        if self._connection is not None:
+            self._connection.close()
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        shutil.rmtree(self._user_data_dir, ignore_errors=True)
+
+    def call_function_on(
+        self,
+        object_id: str,
+        function_declaration: str,
+        *args: Any,
+        return_by_value: bool = True
+    ) -> Any:
+        """Calls a javascript function with the remote object as `this`."""
+        try:
+            result: Dict = self.send("Runtime.callFunctionOn", {
+                'functionDeclaration': function_declaration,
+                'objectId': object_id,
+                'arguments': [{'value': arg} for arg in args],
+                'objectGroup': self._object_group,
+                'returnByValue': return_by_value
+            })
+            self._raise_if_script_failed(result)
+        except WebDriverException as error:
+            _raise_if_stale(error)
+            raise
+        if return_by_value:
+            return result['result'].get('value')
+        return result
+
+    def _launch_chromium(
+        self, binary_path: Optional[str], headless: bool
+    ) -> subprocess.Popen:
+        if binary_path is None:
+            for binary_name in self._binary_names:
+                binary_path = shutil.which(binary_name)
+                if binary_path is not None:
+                    break
+            else:
+                raise WebDriverException(
+                    "Could not find a Chromium binary in PATH."
+                )
+        args: List[str] = [
+            binary_path,
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self._user_data_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--disable-background-networking",
+            "about:blank"
+        ]
+        if headless:
+            args.insert(1, "--headless")
+        if hasattr(os, "geteuid") and os.geteuid() == 0:
+            # Chromium refuses to start as root with its sandbox, such as
+            # within containers.
+            args.insert(1, "--no-sandbox")
+        return subprocess.Popen(
+            args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    def _get_browser_websocket_url(self, timeout: int = 30) -> str:
+        """Reads the debugger address Chromium writes into its profile."""
+        active_port_path: str = os.path.join(
+            self._user_data_dir, "DevToolsActivePort"
+        )
+        end_time: float = time.time() + timeout
+        while time.time() < end_time:
+            if self._process.poll() is not None:
+                raise WebDriverException(
+                    "Chromium exited early with code "
+                    f"{self._process.returncode}."
+                )
+            try:
+                with open(active_port_path) as active_port_file:
+                    lines: List[str] = active_port_file.read().splitlines()
+                if len(lines) >= 2:
+                    return f"ws://127.0.0.1:{lines[0]}{lines[1]}"
+            except FileNotFoundError:
+                pass
+            time.sleep(0.1)
+        raise TimeoutException("Chromium did not open a DevTools port.")
+
+    def _wait_for_lifecycle(
+        self,
+        previous_loader_id: Optional[str],
+        event_name: str,
+        timeout: float
+    ) -> None:
+        """Waits for the newest main frame document to reach the event.
+
+        Follows whichever document replaced the previous one last, so that a
+        client-side redirect replacing the page before it loads, such as the
+        SSO auto-submit forms, is waited on instead of the replaced page.
+        """
+        end_time: float = time.time() + timeout
+        while (
+            self._latest_loader_id == previous_loader_id
+            or event_name not in self._loader_lifecycles.get(
+                self._latest_loader_id, ()
+            )
+        ):
+            remaining_time: float = end_time - time.time()
+            if remaining_time <= 0:
+                raise TimeoutException(
+                    f"Timed out waiting for the {event_name} event."
+                )
+            self.wait_for_event(remaining_time)
+
+    def _on_frame_navigated(self, params: Dict) -> None:
+        frame: Dict = params['frame']
+        if 'parentId' not in frame:
+            self._main_frame_id = frame['id']
+            self.current_url = frame['url']
+
+    def _on_navigated_within_document(self, params: Dict) -> None:
+        if params['frameId'] == self._main_frame_id:
+            self.current_url = params['url']
+
+    def _on_lifecycle_event(self, params: Dict) -> None:
+        if params['frameId'] != self._main_frame_id:
+            return
+        if params['name'] == "init":
+            # A new document replaces the old one, so forget older loaders.
+            self._latest_loader_id = params['loaderId']
+            self._loader_lifecycles = {}
+        self._loader_lifecycles.setdefault(
+            params['loaderId'], set()
+        ).add(params['name'])
+
+    def _to_elements(self, result: Dict) -> List[DevToolsElement]:
+        """Converts a remote array of nodes into element handles."""
+        self._raise_if_script_failed(result, InvalidSelectorException)
+        array_object_id: str = result['result']['objectId']
+        try:
+            properties: List[Dict] = self.send("Runtime.getProperties", {
+                'objectId': array_object_id, 'ownProperties': True
+            })['result']
+        finally:
+            self._release_object(array_object_id)
+        return [
+            DevToolsElement(self, remote_property['value']['objectId'])
+            for remote_property in properties
+            if remote_property['name'].isdigit()
+        ]
+
+    def _to_python(self, remote_object: Dict) -> Any:
+        """Converts a remote object into elements or plain python values."""
+        if 'objectId' not in remote_object:
+            return remote_object.get('value')
+        if remote_object.get('subtype') == "node":
+            return DevToolsElement(self, remote_object['objectId'])
+        if remote_object.get('subtype') == "array":
+            return [
+                self._to_python(remote_property['value'])
+                for remote_property in self.send("Runtime.getProperties", {
+                    'objectId': remote_object['objectId'],
+                    'ownProperties': True
+                })['result']
+                if remote_property['name'].isdigit()
+            ]
+        return self.call_function_on(
+            remote_object['objectId'], "function() { return this; }"
+        )
+
+    def _release_object(self, object_id: str) -> None:
+        try:
+            self.send("Runtime.releaseObject", {'objectId': object_id})
+        except WebDriverException:
+            pass  # The context is already gone after a navigation.
+
+    def _raise_if_script_failed(
+        self, result: Dict, exception: Any = WebDriverException
+    ) -> None:
+        if 'exceptionDetails' in result:
+            details: Dict = result['exceptionDetails']
+            raise exception(
+                details.get('exception', {}).get('description')
+                or details.get('text')
+            )
+
+
+class DevToolsElement():
+    """A handle to a DOM element within a ChromiumDevToolsDriver page.
+
+    Implements the subset of the selenium WebElement interface used by this
+    project. Like a WebElement, the handle goes stale once the element is
+    removed from the page, such as by a partial page render, or once its page
+    navigates away.
+
+    Parameters
+    ----------
+        driver : ChromiumDevToolsDriver
+            The driver that owns the page the element is in.
+        object_id : str
+            The DevTools Runtime remote object id of the element.
+    """
+
+    def __init__(self, driver: ChromiumDevToolsDriver, object_id: str) -> None:
+        self.parent: ChromiumDevToolsDriver = driver
+        self.object_id: str = object_id
+        self._backend_node_id: Optional[int] = None
+
+    @property
+    def id(self) -> str:
+        return self.object_id
+
+    @property
+    def tag_name(self) -> str:
+        return self._call(
+            "function() { return this.tagName.toLowerCase(); }"
+        )
+
+    @property
+    def text(self) -> str:
+        return self._call(
+            "function() { return this.innerText; }"
+        )
+
+    def click(self) -> None:
+        """Clicks the center of the element with real mouse events."""
+        x, y = self._call(_CLICK_POINT_JS)
+        for event_type in ("mousePressed", "mouseReleased"):
+            self.parent.send("Input.dispatchMouseEvent", {
+                'type': event_type,
+                'x': x,
+                'y': y,
+                'button': "left",
+                'clickCount': 1
+            })
+
+    def clear(self) -> None:
+        self._call(_CLEAR_JS)
+
+    def send_keys(self, *value: str) -> None:
+        """Types the text into the element, as keys or as inserted text."""
+        self._call("function() { this.focus(); }")
+        text: str = "".join(value)
+        pending_text: str = ""
+        for character in text:
+            if character not in _KEY_EVENTS:
+                pending_text += character
+                continue
+            if pending_text != "":
+                self.parent.send("Input.insertText", {'text': pending_text})
+                pending_text = ""
+            self.parent.send("Input.dispatchKeyEvent", {
+                'type': "keyDown", **_KEY_EVENTS[character]
+            })
+            self.parent.send("Input.dispatchKeyEvent", {
+                'type': "keyUp", **_KEY_EVENTS[character]
+            })
+        if pending_text != "":
+            self.parent.send("Input.insertText", {'text': pending_text})
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self._call(
+            _GET_ATTRIBUTE_JS, name
+        )
+
+    def get_property(self, name: str) -> Any:
+        return self._call(
+            "function(name) { return this[name]; }", name
+        )
+
+    def is_displayed(self) -> bool:
+        return self._call(_IS_DISPLAYED_JS)
+
+    def is_enabled(self) -> bool:
+        return self._call(
+            "function() { return !this.disabled; }"
+        )
+
+    def find_element(
+        self, by: str = By.ID, value: Optional[str] = None
+    ) -> Any:
+        return _first_element(self.find_elements(by, value), by, value)
+
+    def find_elements(
+        self, by: str = By.ID, value: Optional[str] = None
+    ) -> List[DevToolsElement]:
+        """Finds elements using this element as the search root."""
+        result: Dict = self._call(
+            _FIND_ELEMENTS_JS, by, value,
+            return_by_value=False
+        )
+        return self.parent._to_elements(result)
+
+    def find_element_by_xpath(self, xpath: str) -> Any:
+        return self.find_element(By.XPATH, xpath)
+
+    def find_elements_by_xpath(self, xpath: str) -> List[Any]:
+        return self.find_elements(By.XPATH, xpath)
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, DevToolsElement)
+            and other.parent is self.parent
+            and other._get_backend_node_id() == self._get_backend_node_id()
+        )
+
+    def __hash__(self) -> int:
+        return hash(self._get_backend_node_id())
+
+    def _call(
+        self,
+        function_declaration: str,
+        *args: Any,
+        return_by_value: bool = True
+    ) -> Any:
+        """Calls the javascript function on the element if it is attached.
+
+        Raises StaleElementReferenceException once the element has been
+        removed from the page, even though its remote object is still alive.
+        """
+        return self.parent.call_function_on(
+            self.object_id,
+            "function(...args) {{ if (!this.isConnected) {{ throw new Error("
+            "{error}); }} return ({function}).apply(this, args); }}".format(
+                error=json.dumps(_DETACHED_ELEMENT_ERROR),
+                function=function_declaration
+            ),
+            *args,
+            return_by_value=return_by_value
+        )
+
+    def _get_backend_node_id(self) -> int:
+        """Gets the node's own id, which every handle to the node shares."""
+        if self._backend_node_id is None:
+            try:
+                self._backend_node_id = self.parent.send(
+                    "DOM.describeNode", {'objectId': self.object_id}
+                )['node']['backendNodeId']
+            except WebDriverException as error:
+                _raise_if_stale(error)
+                raise
+        return self._backend_node_id
+
+
+class DevToolsWait(WebDriverWait):
+    """WebDriverWait that wakes up on pushed DevTools events.
+
+    Instead of sleeping for the whole poll interval between checks, the
+    condition is re-checked as soon as the browser reports anything, such as a
+    navigation or a lifecycle event.
+    """
+
+    def until(self, method: Callable, message: str = '') -> Any:
+        end_time: float = time.time() + self._timeout
+        while True:
+            try:
+                value: Any = method(self._driver)
+                if value:
+                    return value
+            except self._ignored_exceptions:
+                pass
+            remaining_time: float = end_time - time.time()
+            if remaining_time <= 0:
+                break
+            self._driver.wait_for_event(min(self._poll, remaining_time))
+        raise TimeoutException(message)
+
+    def until_not(self, method: Callable, message: str = '') -> Any:
+        end_time: float = time.time() + self._timeout
+        while True:
+            try:
+                value: Any = method(self._driver)
+                if not value:
+                    return value
+            except self._ignored_exceptions:
+                return True
+            remaining_time: float = end_time - time.time()
+            if remaining_time <= 0:
+                break
+            self._driver.wait_for_event(min(self._poll, remaining_time))
+        raise TimeoutException(message)
+
+
+def _first_element(
+    elements: List[DevToolsElement], by: str, value: Optional[str]
+) -> DevToolsElement:
+    if len(elements) == 0:
+        raise NoSuchElementException(
+            f"Unable to locate element: {{\"method\":\"{by}\","
+            f"\"selector\":\"{value}\"}}"
+        )
+    return elements[0]
+
+
+def _raise_if_stale(error: WebDriverException) -> None:
+    if any(message in str(error) for message in _STALE_OBJECT_ERRORS):
+        raise StaleElementReferenceException(
+            "Element is no longer attached to the page."
+        ) from error
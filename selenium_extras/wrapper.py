@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from selenium_extras.additional_exceptions import BrowserNotExpected
+from selenium_extras.devtools import ChromiumDevToolsDriver, DevToolsWait
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -16,9 +17,11 @@ class Browser():
     Parameters
     ----------
         browser : str
-            Valid options are: "chrome", "edge", "firefox", "ie"
+            Valid options are: "chrome", "chromium", "edge", "firefox", "ie"
         driver_path : str, optional
-            File path to webdriver. Will look in PATH if not set.
+            File path to webdriver. Will look in PATH if not set. For
+            "chromium", this is the path to the Chromium binary instead, since
+            it is driven directly through the DevTools Protocol.
         default_wait_time : int, optional
             Default amount of time in seconds to wait when locating elements
             before timing out.
@@ -38,8 +41,8 @@ class Browser():
         default_wait_time: int = 60
     ) -> None:
         self.driver: Any = self._get_driver(browser, driver_path)
-        self.driver_default_wait: WebDriverWait = WebDriverWait(
-            driver=self.driver, timeout=default_wait_time
+        self.driver_default_wait: WebDriverWait = self._get_wait(
+            default_wait_time
         )
 
     def _get_driver(
@@ -50,6 +53,8 @@ class Browser():
         if lowercased_browser == "chrome":
             driver = webdriver.Chrome() if driver_path is None else  \
                 webdriver.Chrome(executable_path=driver_path)
+        elif lowercased_browser in ("chromium", "chrome_devtools", "cdp"):
+            driver = ChromiumDevToolsDriver(binary_path=driver_path)
         elif lowercased_browser in ("edge", "msedge"):
             driver = webdriver.Edge() if driver_path is None else  \
                 webdriver.Edge(executable_path=driver_path)
@@ -63,11 +68,18 @@ class Browser():
                 webdriver.Ie(executable_path=driver_path)
         else:
             raise BrowserNotExpected(
-                "Valid browser options are \"chrome\", \"edge\", \"firefox\", "
-                "and \"ie\"."
+                "Valid browser options are \"chrome\", \"chromium\", "
+                "\"edge\", \"firefox\", and \"ie\"."
             )
         return driver
 
+    def _get_wait(self, wait_time: int) -> WebDriverWait:
+        """Gets a wait suited to the driver, with wait_time as its timeout."""
+        if isinstance(self.driver, ChromiumDevToolsDriver):
+            # Wakes up on pushed browser events instead of only polling.
+            return DevToolsWait(driver=self.driver, timeout=wait_time)
+        return WebDriverWait(driver=self.driver, timeout=wait_time)
+
     def go_to(self, url: str) -> None:
         """Goes to the url specified."""
         self.driver.get(url)
@@ -90,12 +102,10 @@ class Browser():
             )
         elif wait_time == 0:
             element = self.driver.find_element(
-                locator
+                *locator
             )
         else:
-            element = WebDriverWait(
-                driver=self.driver, timeout=wait_time
-            ).until(
+            element = self._get_wait(wait_time).until(
                 EC.visibility_of_element_located(
                     locator
                 )
@@ -117,9 +127,7 @@ class Browser():
                 id
             )
         else:
-            element = WebDriverWait(
-                driver=self.driver, timeout=wait_time
-            ).until(
+            element = self._get_wait(wait_time).until(
                 EC.visibility_of_element_located(
                     (By.ID, id)
                 )
@@ -141,9 +149,7 @@ class Browser():
                 link_text
             )
         else:
-            element = WebDriverWait(
-                driver=self.driver, timeout=wait_time
-            ).until(
+            element = self._get_wait(wait_time).until(
                 EC.visibility_of_element_located(
                     (By.LINK_TEXT, link_text)
                 )
@@ -165,9 +171,7 @@ class Browser():
                 xpath
             )
         else:
-            element = WebDriverWait(
-                driver=self.driver, timeout=wait_time
-            ).until(
+            element = self._get_wait(wait_time).until(
                 EC.visibility_of_element_located(
                     (By.XPATH, xpath)
                 )
@@ -177,7 +181,7 @@ class Browser():
     def get_elements(self, locator: Tuple[Any, str]) -> List[Any]:
         """Gets a list of the elements that match the locator."""
         return self.driver.find_elements(
-            locator
+            *locator
         )
 
     def get_elements_by_link_text(self, link_text: str) -> List[Any]:
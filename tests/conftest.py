@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from selenium_extras.devtools import ChromiumDevToolsDriver
+
+import os
+import pytest
+import shutil
+from typing import Optional
+
+
+@pytest.fixture(scope="session")
+def chromium_path() -> str:
+    """Gets the Chromium binary from OTL_CHROMIUM_PATH, else from PATH.
+
+    Skips the test when there is none.
+    """
+    if os.environ.get("OTL_CHROMIUM_PATH"):
+        return os.environ["OTL_CHROMIUM_PATH"]
+    for binary_name in ChromiumDevToolsDriver._binary_names:
+        binary_path: Optional[str] = shutil.which(binary_name)
+        if binary_path is not None:
+            return binary_path
+    pytest.skip("No Chromium binary found.")
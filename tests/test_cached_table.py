@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from selenium_extras.cached_table import CachedTable
+
+import pytest
+from selenium.common.exceptions import (
+    StaleElementReferenceException, TimeoutException
+)
+from typing import Any, Callable, Dict, List, Optional
+
+
+class _FakeElement():
+    """Element that raises like selenium's once it has been replaced."""
+
+    def __init__(
+        self,
+        children: Optional[Dict[str, List[_FakeElement]]] = None,
+        is_displayed: bool = True
+    ) -> None:
+        self.children: Dict[str, List[_FakeElement]] = children or {}
+        self.is_stale: bool = False
+        self._is_displayed: bool = is_displayed
+        self.num_queries: int = 0
+
+    def find_elements_by_xpath(self, xpath: str) -> List[_FakeElement]:
+        self._raise_if_stale()
+        self.num_queries += 1
+        return self.children.get(xpath, [])
+
+    def is_displayed(self) -> bool:
+        self._raise_if_stale()
+        return self._is_displayed
+
+    def _raise_if_stale(self) -> None:
+        if self.is_stale:
+            raise StaleElementReferenceException("Element is stale.")
+
+
+class _FakeDriver():
+    def __init__(self) -> None:
+        self.num_releases: int = 0
+
+    def release_elements(self) -> None:
+        self.num_releases += 1
+
+
+class _FakeWait():
+    """Polls like WebDriverWait, without sleeping in between."""
+
+    def __init__(self, driver: _FakeDriver, max_tries: int = 3) -> None:
+        self._driver: _FakeDriver = driver
+        self._max_tries: int = max_tries
+
+    def until(self, method: Callable) -> Any:
+        for _ in range(self._max_tries):
+            value: Any = method(self._driver)
+            if value:
+                return value
+        raise TimeoutException("Timed out polling.")
+
+
+class _FakeBrowser():
+    """Browser whose page renders tbody in place of the previous one."""
+
+    def __init__(self, tbody: _FakeElement) -> None:
+        self.driver: _FakeDriver = _FakeDriver()
+        self.driver_default_wait: _FakeWait = _FakeWait(self.driver)
+        self.tbody: _FakeElement = tbody
+        self.num_tbody_lookups: int = 0
+
+    def get_element_by_xpath(self, xpath: str) -> _FakeElement:
+        assert xpath == "//tbody"
+        self.num_tbody_lookups += 1
+        return self.tbody
+
+    def render(self, tbody: _FakeElement) -> None:
+        """Replaces the tbody the way a partial page render does."""
+        self.tbody.is_stale = True
+        self.tbody = tbody
+
+
+def _row_inputs_xpath(tr_num: int) -> str:
+    return f"./tr[{tr_num}]//input"
+
+
+def _button_xpath(text: str) -> str:
+    return f".//button[contains(., '{text}')]"
+
+
+def test_stale_tbody_is_located_again_once() -> None:
+    first_row_inputs: List[_FakeElement] = [_FakeElement()]
+    browser: _FakeBrowser = _FakeBrowser(_FakeElement({
+        _row_inputs_xpath(2): first_row_inputs
+    }))
+    table: CachedTable = CachedTable(browser, "//tbody")
+    assert table.get_row_inputs(0) == first_row_inputs
+    assert table.get_row_inputs(0) == first_row_inputs
+    assert browser.num_tbody_lookups == 1
+
+    second_row_inputs: List[_FakeElement] = [_FakeElement()]
+    browser.render(_FakeElement({
+        _row_inputs_xpath(2): first_row_inputs,
+        _row_inputs_xpath(3): second_row_inputs
+    }))
+    assert table.get_row_inputs(1) == second_row_inputs
+    assert browser.num_tbody_lookups == 2
+    assert browser.driver.num_releases == 1
+
+
+def test_tbody_that_stays_stale_is_not_retried_again() -> None:
+    tbody: _FakeElement = _FakeElement()
+    tbody.is_stale = True
+    browser: _FakeBrowser = _FakeBrowser(tbody)
+    table: CachedTable = CachedTable(browser, "//tbody")
+    with pytest.raises(StaleElementReferenceException):
+        table.get_row_inputs(0)
+    assert browser.num_tbody_lookups == 2
+
+
+def test_empty_rows_are_not_cached() -> None:
+    tbody: _FakeElement = _FakeElement()
+    browser: _FakeBrowser = _FakeBrowser(tbody)
+    table: CachedTable = CachedTable(browser, "//tbody", num_header_rows=2)
+    assert table.get_row_inputs(0) == []
+    # The row is rendered within the same tbody later on.
+    row_inputs: List[_FakeElement] = [_FakeElement(), _FakeElement()]
+    tbody.children = {_row_inputs_xpath(3): row_inputs}
+    assert table.get_row_inputs(0) == row_inputs
+    num_queries: int = tbody.num_queries
+    assert table.get_row_inputs(0) == row_inputs
+    assert tbody.num_queries == num_queries
+
+
+def test_button_is_located_again_after_invalidate() -> None:
+    hidden_button: _FakeElement = _FakeElement(is_displayed=False)
+    first_button: _FakeElement = _FakeElement()
+    tbody: _FakeElement = _FakeElement({
+        _button_xpath("Add Another Row"): [hidden_button, first_button]
+    })
+    browser: _FakeBrowser = _FakeBrowser(tbody)
+    table: CachedTable = CachedTable(browser, "//tbody")
+    assert table.get_button("Add Another Row") is first_button
+    assert table.get_button("Add Another Row") is first_button
+    assert tbody.num_queries == 1
+
+    second_button: _FakeElement = _FakeElement()
+    browser.render(_FakeElement({
+        _button_xpath("Add Another Row"): [second_button]
+    }))
+    table.invalidate()
+    assert table.get_button("Add Another Row") is second_button
+    assert browser.num_tbody_lookups == 2
+
+
+def test_missing_button_times_out() -> None:
+    browser: _FakeBrowser = _FakeBrowser(_FakeElement())
+    table: CachedTable = CachedTable(browser, "//tbody")
+    with pytest.raises(TimeoutException):
+        table.get_button("Add Another Row")
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from selenium_extras.devtools import ChromiumDevToolsDriver, DevToolsWait
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from selenium.common.exceptions import (
+    NoSuchElementException, StaleElementReferenceException
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+import tempfile
+import threading
+import time
+from typing import Any, Iterator
+from urllib.parse import quote
+
+
+def _data_url(html: str) -> str:
+    return "data:text/html," + quote(html)
+
+
+class _PageRequestHandler(BaseHTTPRequestHandler):
+    """Serves a page that replaces itself with javascript before it loads."""
+
+    def do_GET(self) -> None:
+        if self.path == "/redirect":
+            html: str = (
+                "<script>location.replace('/landing');</script>"
+                # Keeps the replaced page from loading before the redirect.
+                '<img src="/slow">'
+            )
+        elif self.path == "/slow":
+            time.sleep(5)
+            html = ""
+        elif self.path == "/landing":
+            html = '<p id="landing">Landed</p>'
+        else:
+            html = ""
+        body: bytes = html.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def driver(chromium_path: str) -> Iterator[ChromiumDevToolsDriver]:
+    chromium_driver: ChromiumDevToolsDriver = ChromiumDevToolsDriver(
+        binary_path=chromium_path, page_load_timeout=30, network_idle_timeout=1
+    )
+    yield chromium_driver
+    chromium_driver.quit()
+
+
+def test_failed_launch_leaves_no_profile_behind(
+    monkeypatch: Any, tmp_path: Any
+) -> None:
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    with pytest.raises(OSError):
+        ChromiumDevToolsDriver(binary_path=str(tmp_path / "missing"))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_removed_element_goes_stale(driver: ChromiumDevToolsDriver) -> None:
+    driver.get(_data_url('<div id="table"><input id="old" value="x"></div>'))
+    old_input = driver.find_element_by_id("old")
+    # Replaces the table the way a partial page render does.
+    driver.execute_script(
+        "document.getElementById('table').innerHTML = '<input id=\"new\">';"
+    )
+    with pytest.raises(StaleElementReferenceException):
+        old_input.get_attribute("value")
+    with pytest.raises(StaleElementReferenceException):
+        old_input.send_keys("y")
+    assert EC.staleness_of(old_input)(driver) is True
+    assert driver.find_element_by_id("new").tag_name == "input"
+
+
+def test_find_elements_by_each_locator(
+    driver: ChromiumDevToolsDriver
+) -> None:
+    driver.get(_data_url(
+        '<div id="root"><a href="#one">First link</a>'
+        '<input name="field" class="box"><span class="box">Text</span></div>'
+    ))
+    assert driver.find_element_by_id("root").tag_name == "div"
+    assert driver.find_element(By.NAME, "field").tag_name == "input"
+    assert driver.find_element_by_link_text("First link").tag_name == "a"
+    assert driver.find_element(
+        By.PARTIAL_LINK_TEXT, "First"
+    ).tag_name == "a"
+    assert len(driver.find_elements(By.CLASS_NAME, "box")) == 2
+    assert len(driver.find_elements(By.CSS_SELECTOR, "#root .box")) == 2
+    assert [
+        element.text for element in driver.find_elements_by_xpath(
+            "//span[contains(., 'Text')]"
+        )
+    ] == ["Text"]
+    root = driver.find_element_by_id("root")
+    assert len(root.find_elements_by_xpath(".//*[@class='box']")) == 2
+    assert root == driver.find_element_by_id("root")
+    assert len({root, driver.find_element_by_id("root")}) == 1
+    with pytest.raises(NoSuchElementException):
+        driver.find_element_by_id("missing")
+
+
+def test_click_send_keys_and_get_attribute(
+    driver: ChromiumDevToolsDriver
+) -> None:
+    driver.get(_data_url(
+        '<input id="field" value="old" onchange="this.dataset.changed=1">'
+        '<button id="button" onclick="this.textContent = \'Clicked\'">'
+        "Click</button>"
+    ))
+    field = driver.find_element_by_id("field")
+    assert field.get_attribute("value") == "old"
+    field.clear()
+    field.send_keys("new value", Keys.TAB)
+    assert field.get_attribute("value") == "new value"
+    # Leaving the field with a real key event triggers the change handler.
+    assert field.get_attribute("data-changed") == "1"
+    assert field.get_attribute("missing") is None
+    button = driver.find_element_by_id("button")
+    assert button.is_displayed() and button.is_enabled()
+    button.click()
+    assert button.text == "Clicked"
+
+
+def test_execute_script_converts_results(
+    driver: ChromiumDevToolsDriver
+) -> None:
+    driver.get(_data_url('<p id="paragraph">Text</p>'))
+    paragraph = driver.find_element_by_id("paragraph")
+    assert driver.execute_script(
+        "return [arguments[0].id, arguments[1] + 1, {key: 'value'}];",
+        paragraph, 1
+    ) == ["paragraph", 2, {'key': "value"}]
+    assert driver.execute_script(
+        "return document.getElementById('paragraph');"
+    ) == paragraph
+    # Large enough to need the websocket's 64-bit frame length.
+    assert len(driver.execute_script("return 'x'.repeat(100000);")) == 100000
+
+
+def test_get_follows_a_redirect_before_load(chromium_path: str) -> None:
+    server: ThreadingHTTPServer = ThreadingHTTPServer(
+        ("127.0.0.1", 0), _PageRequestHandler
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # Short enough that waiting on the replaced page would fail the test.
+    chromium_driver: ChromiumDevToolsDriver = ChromiumDevToolsDriver(
+        binary_path=chromium_path, page_load_timeout=10, network_idle_timeout=1
+    )
+    try:
+        chromium_driver.get(f"http://127.0.0.1:{server.server_port}/redirect")
+        assert chromium_driver.current_url.endswith("/landing")
+        assert chromium_driver.find_element_by_id("landing").text == "Landed"
+    finally:
+        chromium_driver.quit()
+        server.shutdown()
+        server.server_close()
+
+
+def test_wait_wakes_up_on_page_changes(
+    driver: ChromiumDevToolsDriver
+) -> None:
+    driver.get(_data_url(
+        "<script>setTimeout(() => document.body.innerHTML = "
+        "'<p id=\"late\">Late</p>', 500);</script>"
+    ))
+    late = DevToolsWait(driver=driver, timeout=10).until(
+        EC.visibility_of_element_located((By.ID, "late"))
+    )
+    assert late.text == "Late"
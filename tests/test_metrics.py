@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import metrics
+
+import pytest
+from requests.exceptions import ReadTimeout
+from selenium.common.exceptions import TimeoutException
+from typing import Any, List, Tuple
+from urllib.request import urlopen
+
+
+def _get_value(metric: metrics.Metric, *label_values: str) -> Any:
+    return metric._values.get(label_values, 0)
+
+
+class _FakeWebDriver():
+    def __init__(self) -> None:
+        self.commands: List[Tuple[str, Any]] = []
+
+    def execute(self, command: str, params: Any = None) -> str:
+        self.commands.append((command, params))
+        return "result"
+
+
+class _FakeDevToolsDriver():
+    def send(self, command: str, **params: Any) -> str:
+        return command
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram: metrics.Histogram = metrics.Histogram(
+        "test_duration_seconds", "Test durations.",
+        label_names=("phase",), buckets=(0.5, 1, 2.5)
+    )
+    for value in (0.25, 0.75, 0.75, 2, 10):
+        histogram.observe(value, phase="login")
+    assert histogram.render() == [
+        "# HELP test_duration_seconds Test durations.",
+        "# TYPE test_duration_seconds histogram",
+        'test_duration_seconds_bucket{phase="login",le="0.5"} 1',
+        'test_duration_seconds_bucket{phase="login",le="1"} 3',
+        'test_duration_seconds_bucket{phase="login",le="2.5"} 4',
+        'test_duration_seconds_bucket{phase="login",le="+Inf"} 5',
+        'test_duration_seconds_sum{phase="login"} 13.75',
+        'test_duration_seconds_count{phase="login"} 5'
+    ]
+
+
+def test_label_values_are_escaped() -> None:
+    counter: metrics.Counter = metrics.Counter(
+        "test_total", "Test count.", label_names=("exception",)
+    )
+    counter.inc(2, exception='Path\\To "Error"')
+    assert counter.render()[2] ==  \
+        'test_total{exception="Path\\\\To \\"Error\\""} 2'
+
+
+@pytest.mark.parametrize("error", [
+    TimeoutException("Timed out waiting."),
+    ReadTimeout("Timed out reading."),
+    TimeoutError("Timed out.")
+])
+def test_timeouts_are_counted_as_timeout_error(error: Exception) -> None:
+    num_failed: float = _get_value(metrics.cards_failed, "TimeoutError")
+    num_completed: float = _get_value(metrics.cards_completed)
+    with pytest.raises(type(error)):
+        with metrics.track_card():
+            raise error
+    assert _get_value(metrics.cards_failed, "TimeoutError") == num_failed + 1
+    assert _get_value(metrics.cards_completed) == num_completed
+    assert _get_value(metrics.cards_in_flight) == 0
+
+
+def test_completed_cards_are_counted() -> None:
+    num_completed: float = _get_value(metrics.cards_completed)
+    with metrics.track_card():
+        assert _get_value(metrics.cards_in_flight) == 1
+    assert _get_value(metrics.cards_completed) == num_completed + 1
+    assert _get_value(metrics.cards_in_flight) == 0
+
+
+def test_count_driver_commands_wraps_execute() -> None:
+    driver: _FakeWebDriver = _FakeWebDriver()
+    num_clicks: float = _get_value(
+        metrics.webdriver_commands, "clickElement"
+    )
+    metrics.count_driver_commands(driver)
+    assert driver.execute("clickElement", {'id': "1"}) == "result"
+    assert driver.execute("clickElement") == "result"
+    assert driver.commands == [
+        ("clickElement", {'id': "1"}), ("clickElement", None)
+    ]
+    assert _get_value(
+        metrics.webdriver_commands, "clickElement"
+    ) == num_clicks + 2
+
+
+def test_count_driver_commands_wraps_send() -> None:
+    driver: _FakeDevToolsDriver = _FakeDevToolsDriver()
+    num_evaluates: float = _get_value(
+        metrics.webdriver_commands, "Runtime.evaluate"
+    )
+    metrics.count_driver_commands(driver)
+    assert driver.send(
+        "Runtime.evaluate", expression="1"
+    ) == "Runtime.evaluate"
+    assert _get_value(
+        metrics.webdriver_commands, "Runtime.evaluate"
+    ) == num_evaluates + 1
+
+
+def test_metrics_are_served_and_written(tmp_path: Any) -> None:
+    server: Any = metrics.start_http_server(0)
+    try:
+        with urlopen(
+            f"http://127.0.0.1:{server.server_port}/metrics"
+        ) as response:
+            assert "# TYPE otl_cards_completed_total counter" in  \
+                response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+    metrics_path: Any = tmp_path / "otl.prom"
+    metrics.write_file(str(metrics_path))
+    assert metrics_path.read_text() == metrics.registry.render()
+
+
+def test_file_writer_logs_failed_writes(tmp_path: Any, caplog: Any) -> None:
+    file_writer: metrics.FileWriter = metrics.FileWriter(
+        path=str(tmp_path / "missing" / "otl.prom"), interval=60
+    )
+    file_writer.start()
+    file_writer.stop()
+    assert "Could not write the metrics file" in caplog.text
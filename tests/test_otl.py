@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import constants
+import export_timecards
+from otl import OracleTimeAndLabor, TimecardCsv
+from selenium_extras.additional_exceptions import BrowserNotExpected
+
+import csv
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import threading
+from typing import Any, Dict, Iterator, List
+from urllib.parse import parse_qs, urlparse
+
+
+# Periods listed on each page of the mock Recent Timecards.
+_RECENT_TIMECARDS_PAGES: List[List[str]] = [
+    ["05-Oct-2020 - 11-Oct-2020", "28-Sep-2020 - 04-Oct-2020"],
+    ["21-Sep-2020 - 27-Sep-2020"]
+]
+_NUM_HTML_COLS: int = 26
+
+
+def _timecard_page(project: str) -> str:
+    """Nests a one row timecard the way constants' XPath expects."""
+    inputs: str = "".join(
+        f'<td><input value="{value}"></td>' for value in (
+            [project, "1.01.00", "LABOR - Straight Time", "US", "IL"]
+            + ["09:00", "17:00"] + [""] * (_NUM_HTML_COLS - 7)
+        )
+    )
+    padding_rows: str = "<tr><td></td></tr>" * 4
+    return (
+        '<span id="Hxctimecard"><table></table><table><tr><td><table></table>'
+        f"<table>{padding_rows}<tr><td><table>{padding_rows}<tr><td></td><td>"
+        f"<table><tr><th>Project</th></tr><tr>{inputs}</tr></table>"
+        "</td></tr></table></td></tr></table></td></tr></table></span>"
+    )
+
+
+def test_get_csv_row_skips_the_hours_inputs() -> None:
+    html_row_values: List[str] = [
+        "Project A", "1.01.00", "LABOR - Straight Time", "US", "IL",
+        # Saturday's start, stop, and hours, then Sunday's.
+        "9:00 AM", "17:00", "8", "", "", "",
+        # Monday's start is converted, but text that is not a time is kept.
+        "8:30:00 AM", "n/a"
+    ]
+    assert TimecardCsv()._get_csv_row(html_row_values) == [
+        "Project A", "1.01.00", "LABOR - Straight Time", "US", "IL",
+        "09:00", "17:00", "", "", "08:30", "n/a"
+    ] + [""] * 8
+
+
+def test_get_csv_row_reverses_the_html_input_data() -> None:
+    csv_row: List[str] = [
+        "Project C", "1.03.00", "Vacation", "US", "IL"
+    ] + [""] * 4 + ["08:30", "12:00"] + [""] * 6 + ["13:00", "17:30"]
+    timecard_csv: TimecardCsv = TimecardCsv()
+    html_row_values: List[str] = [""] * 26
+    for html_input_num, cell_data in timecard_csv._html_input_data_generator(
+        csv_row
+    ):  # type: int, str
+        html_row_values[html_input_num] = cell_data
+    assert timecard_csv._get_csv_row(html_row_values) == csv_row
+
+
+@pytest.mark.parametrize("timecard_num, period, export_file_name", [
+    (0, "05-Oct-2020 - 11-Oct-2020",
+     "timecard_001_05-Oct-2020_-_11-Oct-2020.csv"),
+    (2, " 1/2/2020 / 1/8/2020 ", "timecard_003_1_2_2020_1_8_2020.csv"),
+    (11, "", "timecard_012.csv")
+])
+def test_get_export_file_name(
+    timecard_num: int, period: str, export_file_name: str
+) -> None:
+    # Skips launching a browser, which naming the files does not need.
+    otl: OracleTimeAndLabor = object.__new__(OracleTimeAndLabor)
+    assert otl._get_export_file_name(timecard_num, period) ==  \
+        export_file_name
+
+
+def test_export_needs_a_browser(monkeypatch: Any) -> None:
+    config: Dict = {
+        'engine': {'choice': "http"},
+        'browser': {'webdriver': {'default_wait_time': 5}}
+    }
+    monkeypatch.setattr(export_timecards, "set_up", lambda: (config, None))
+    with pytest.raises(BrowserNotExpected):
+        export_timecards.main()
+
+
+class _MockRecentTimecardsRequestHandler(BaseHTTPRequestHandler):
+    """Serves pages of Recent Timecards and the timecards they link to."""
+
+    def do_GET(self) -> None:
+        path: str = urlparse(self.path).path
+        query: Dict[str, List[str]] = parse_qs(urlparse(self.path).query)
+        state: Dict = self.server.state  # type: ignore
+        if path == "/recent":
+            page_num: int = int(query['page'][0])
+            state['list_loads'][page_num] += 1
+            html: str = "<table>" + "".join(
+                f"<tr><td>{period}</td><td>"
+                f'<a title="Details" href="/details?period={period}">'
+                "Details</a></td></tr>"
+                for period in _RECENT_TIMECARDS_PAGES[page_num]
+            ) + "</table>"
+            if page_num + 1 < len(_RECENT_TIMECARDS_PAGES):
+                html += f'<a href="/recent?page={page_num + 1}">Next 10</a>'
+        elif path == "/details":
+            html = _timecard_page(project=query['period'][0])
+        else:
+            self.send_error(404)
+            return
+        body: bytes = f"<html><body>{html}</body></html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def mock_recent_timecards() -> Iterator[ThreadingHTTPServer]:
+    server: ThreadingHTTPServer = ThreadingHTTPServer(
+        ("127.0.0.1", 0), _MockRecentTimecardsRequestHandler
+    )
+    server.state = {  # type: ignore
+        'list_loads': [0] * len(_RECENT_TIMECARDS_PAGES)
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_export_loads_each_page_of_recent_timecards_once(
+    chromium_path: str,
+    mock_recent_timecards: ThreadingHTTPServer,
+    tmp_path: Any
+) -> None:
+    otl: OracleTimeAndLabor = OracleTimeAndLabor(
+        browser="chromium", driver_path=chromium_path, default_wait_time=10
+    )
+    try:
+        otl.get(
+            f"http://127.0.0.1:{mock_recent_timecards.server_port}"
+            "/recent?page=0"
+        )
+        otl.export_recent_timecards(export_dir=str(tmp_path))
+    finally:
+        otl.driver.quit()
+
+    state: Dict = mock_recent_timecards.state  # type: ignore
+    assert state['list_loads'] == [1, 1]
+    export_file_names: List[str] = sorted(
+        export_path.name for export_path in tmp_path.iterdir()
+    )
+    assert export_file_names == [
+        "timecard_001_05-Oct-2020_-_11-Oct-2020.csv",
+        "timecard_002_28-Sep-2020_-_04-Oct-2020.csv",
+        "timecard_003_21-Sep-2020_-_27-Sep-2020.csv"
+    ]
+    with open(tmp_path / export_file_names[2], newline="") as export_file:
+        assert list(csv.reader(export_file)) == [
+            constants.timecard['csv_header'],
+            ["21-Sep-2020 - 27-Sep-2020", "1.01.00", "LABOR - Straight Time",
+             "US", "IL", "09:00", "17:00"] + [""] * 12
+        ]
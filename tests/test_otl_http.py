@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import constants
+from otl_http import OracleTimeAndLaborHttp
+from selenium_extras.additional_exceptions import IncorrectLoginDetails
+
+import csv
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+# The hidden state fields every OA Framework form has to post back.
+_HIDDEN_FIELDS: str = (
+    '<input type="hidden" name="_FORM_SUBMITTED" value="">'
+    '<input type="hidden" name="oas" value="STATE123">'
+    '<input type="hidden" name="event" value="">'
+)
+_NUM_HTML_COLS: int = 26
+
+
+def _submit_form_onclick(event: str) -> str:
+    return (
+        "submitForm('DefaultFormName',1,{'_FORM_SUBMITTED':"
+        f"'DefaultFormName','event':'{event}'}});return false"
+    )
+
+
+def _timecard_table(num_html_rows: int) -> str:
+    """Nests the timecard's table the way constants' XPath expects."""
+    rows: str = "".join(
+        "<tr>" + "".join(
+            f'<td><input type="text" name="A{row}N{col}" value=""></td>'
+            for col in range(_NUM_HTML_COLS)
+        ) + "</tr>"
+        for row in range(num_html_rows)
+    )
+    timecard_table: str = (
+        f"<table><tr><th>Project</th></tr>{rows}<tr><td>"
+        f'<button type="button" onclick="{_submit_form_onclick("addRow")}">'
+        "Add Another Row</button></td></tr></table>"
+    )
+    save_button: str = (
+        f'<button type="button" onclick="{_submit_form_onclick("Save")}">'
+        "Save</button>"
+    )
+    padding_rows: str = "<tr><td></td></tr>" * 4
+    return (
+        '<span id="Hxctimecard"><table></table><table><tr><td><table><tr><td>'
+        f"<table></table><table>{padding_rows}<tr><td><table>{padding_rows}"
+        f"<tr><td></td><td>{timecard_table}</td></tr></table></td></tr>"
+        "</table></td></tr></table></td></tr></table></span>"
+        f"{save_button}"
+    )
+
+
+class _MockEbsRequestHandler(BaseHTTPRequestHandler):
+    """Serves just enough of SSO and E-Business Suite to fill a timecard."""
+
+    def do_GET(self) -> None:
+        path: str = urlparse(self.path).path
+        query: Dict[str, List[str]] = parse_qs(urlparse(self.path).query)
+        if path == "/mysso/signon.jsp":
+            self._send_html(
+                '<form name="LoginForm" method="post" '
+                'action="/oam/server/sso/auth_cred_submit">'
+                '<input type="hidden" name="site2pstoretoken" value="token">'
+                '<input id="sso_username" name="ssousername">'
+                '<input id="ssopassword" type="password" name="password">'
+                "</form>"
+            )
+        elif not self._is_logged_in():
+            self._redirect("/mysso/signon.jsp")
+        elif query.get('OAFunc') == ["OAHOMEPAGE"]:
+            self._send_html(
+                '<a href="OA.jsp?OAFunc=OTL">'
+                "US OTL - Emps Eligible for Overtime (Project Accounting)</a>"
+            )
+        elif query.get('OAFunc') == ["OTL"]:
+            self._send_html(
+                '<a href="OA.jsp?_rc=HXCTIMECARDACTIVITIESPAGE">'
+                "Recent Timecards</a>"
+            )
+        elif query.get('_rc') == ["HXCTIMECARDACTIVITIESPAGE"]:
+            self._send_form(
+                '<button id="Hxccreatetcbutton" '
+                f'onclick="{_submit_form_onclick("Create")}">'
+                "Create Timecard</button>"
+            )
+        else:
+            self.send_error(404)
+
+    def do_POST(self) -> None:
+        fields: Dict[str, str] = {
+            name: values[0] for name, values in parse_qs(
+                self.rfile.read(
+                    int(self.headers['Content-Length'])
+                ).decode("utf-8"),
+                keep_blank_values=True
+            ).items()
+        }
+        state: Dict = self.server.state  # type: ignore
+        if self.path == "/oam/server/sso/auth_cred_submit":
+            if (
+                fields.get('ssousername') == "username"
+                and fields.get('password') == "password"
+                and fields.get('site2pstoretoken') == "token"
+            ):
+                # The SSO pages hop back to the website with javascript.
+                self._send_html(
+                    '<form method="POST" action="/OA_HTML/OA.jsp?'
+                    'OAFunc=OAHOMEPAGE"><input type="hidden" name="saml" '
+                    'value="assertion"></form>',
+                    body_attrs=' onload="document.forms[0].submit()"',
+                    headers={'Set-Cookie': "session=valid; Path=/"}
+                )
+            else:
+                self._redirect("/mysso/signon.jsp")
+        elif not self._is_logged_in():
+            self._redirect("/mysso/signon.jsp")
+        elif "OAFunc=OAHOMEPAGE" in self.path:
+            self._redirect("/OA_HTML/OA.jsp?OAFunc=OAHOMEPAGE")
+        elif fields.get('oas') != "STATE123":
+            self.send_error(400, "The hidden form state was not posted back.")
+        else:
+            if fields.get('event') == "Create":
+                state['num_html_rows'] = 1
+            elif fields.get('event') == "addRow":
+                state['num_html_rows'] += 1
+            elif fields.get('event') == "Save":
+                state['saved_fields'] = fields
+            else:
+                self.send_error(400, "The event is not handled.")
+                return
+            self._send_form(_timecard_table(state['num_html_rows']))
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _is_logged_in(self) -> bool:
+        return "session=valid" in self.headers.get("Cookie", "")
+
+    def _redirect(self, location: str) -> None:
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_form(self, html: str) -> None:
+        self._send_html(
+            '<form name="DefaultFormName" method="POST" '
+            'action="OA.jsp?_rc=HXCTIMECARDACTIVITIESPAGE">'
+            f"{_HIDDEN_FIELDS}{html}</form>"
+        )
+
+    def _send_html(
+        self,
+        html: str,
+        body_attrs: str = "",
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        body: bytes = (
+            f"<html><body{body_attrs}>{html}</body></html>"
+        ).encode("utf-8")
+        self.send_response(200)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def mock_ebs() -> Iterator[ThreadingHTTPServer]:
+    server: ThreadingHTTPServer = ThreadingHTTPServer(
+        ("127.0.0.1", 0), _MockEbsRequestHandler
+    )
+    server.state = {  # type: ignore
+        'num_html_rows': 0, 'saved_fields': None
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get_urls(server: ThreadingHTTPServer) -> Dict[str, str]:
+    base_url: str = f"http://127.0.0.1:{server.server_port}"
+    return {
+        **constants.urls['oracle'],
+        'ebusiness': f"{base_url}/OA_HTML/OA.jsp?OAFunc=OAHOMEPAGE",
+        'ebusiness_no_query_parameters': f"{base_url}/OA_HTML/OA.jsp",
+        'single_sign_on': f"{base_url}/mysso/signon.jsp",
+        'single_sign_on_hiccup':
+            f"{base_url}/oam/server/sso/auth_cred_submit"
+    }
+
+
+def test_fill_in_timecard_details_saves_every_row(
+    mock_ebs: ThreadingHTTPServer, tmp_path: Any
+) -> None:
+    timecard_path: Any = tmp_path / "timecard.csv"
+    with open(timecard_path, "w", newline="") as timecard_file:
+        csv_writer: Any = csv.writer(timecard_file)
+        csv_writer.writerow(constants.timecard['csv_header'])
+        csv_writer.writerow(
+            ["Project A", "1.01.00", "LABOR - Straight Time", "US", "IL"]
+            + ["9:00 AM", "17:00"] + [""] * 12
+        )
+        csv_writer.writerow(["Project B", "1.02.00", "Meal", "US", "IL"])
+        csv_writer.writerow(
+            ["Project C", "1.03.00", "Vacation", "US", "IL"]
+            + [""] * 4 + ["08:30", "12:00"] + [""] * 8
+        )
+    otl: OracleTimeAndLaborHttp = OracleTimeAndLaborHttp(
+        default_wait_time=5,
+        sso_username="username",
+        sso_password="password",
+        urls=_get_urls(mock_ebs)
+    )
+    otl.open_oracle_ebusiness_suite()
+    otl.navigate_to_recent_timecards()
+    otl.create_new_timecard()
+    otl.fill_in_timecard_details(timecard_path=str(timecard_path))
+    otl.close()
+
+    state: Dict = mock_ebs.state  # type: ignore
+    # The row without any time entered is skipped.
+    assert state['num_html_rows'] == 2
+    # The filled rows are saved as a draft rather than left in the session.
+    assert state['saved_fields'] is not None
+    saved_fields: Dict[str, str] = {
+        name: value for name, value in state['saved_fields'].items()
+        if name.startswith("A") and value != ""
+    }
+    assert saved_fields == {
+        'A0N0': "Project A", 'A0N1': "1.01.00",
+        'A0N2': "LABOR - Straight Time", 'A0N3': "US", 'A0N4': "IL",
+        'A0N5': "09:00", 'A0N6': "17:00",
+        'A1N0': "Project C", 'A1N1': "1.03.00", 'A1N2': "Vacation",
+        'A1N3': "US", 'A1N4': "IL",
+        # Skips the hours inputs after Saturday's and Sunday's stop times.
+        'A1N11': "08:30", 'A1N12': "12:00"
+    }
+
+
+def test_incorrect_login_details_are_raised(
+    mock_ebs: ThreadingHTTPServer
+) -> None:
+    otl: OracleTimeAndLaborHttp = OracleTimeAndLaborHttp(
+        default_wait_time=5,
+        sso_username="username",
+        sso_password="wrong password",
+        urls=_get_urls(mock_ebs)
+    )
+    with pytest.raises(IncorrectLoginDetails):
+        otl.open_oracle_ebusiness_suite()
+    otl.close()